@@ -38,6 +38,10 @@ setup(
 
     install_requires=_read("requirements.txt").splitlines(),
 
+    extras_require={
+        "fast": ["rapidfuzz"],
+    },
+
     keywords="utility rename tv show",
 
     classifiers=[
@@ -53,5 +57,5 @@ setup(
         "Programming Language :: Python :: 3.6",
     ],
 
-    python_requires=">=3.4"
+    python_requires=">=3.5"
 )
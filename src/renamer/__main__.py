@@ -6,15 +6,15 @@
 
 
 import os
+import sys
+import time
 import logging
 import platform
 
 from renamer import cli
-from renamer import web
-from renamer import localpath
 
 
-def setupLogger(loglevel):
+def setupLogger(loglevel, logPath=None):
     logger = logging.getLogger('Renamer')
     logLevel = getattr(logging, loglevel.upper(), None)
     logger.setLevel(logLevel)
@@ -24,9 +24,11 @@ def setupLogger(loglevel):
     consoleOut.setLevel(logging.INFO)
     consoleOut.setFormatter(consoleFormat)
 
-    logDir = os.path.expandvars('%TMP%') if platform.system() == 'Windows' else '/tmp'
-    logPath = os.path.join(logDir, 'renamer.log')
-    fileOut = logging.FileHandler(logPath, mode='w')
+    if not logPath:
+        logDir = os.path.expandvars('%TMP%') if platform.system() == 'Windows' else '/tmp'
+        logPath = os.path.join(logDir, 'renamer.log')
+    # Only create the log file once something is written to it.
+    fileOut = logging.FileHandler(logPath, mode='w', delay=True)
     fileFormat = logging.Formatter('%(asctime)s: %(levelname)s - %(message)s')
     fileOut.setLevel(logging.WARN)
     fileOut.setFormatter(fileFormat)
@@ -36,20 +38,147 @@ def setupLogger(loglevel):
     return logger
 
 
-def buildNewFileNames(showFiles, showInfo, short=False):
-    for ep in showFiles:
-        try:
-            serie = showInfo[ep.identifier].title
-            showInfo[ep.identifier].season = ep.season
-            episode = '-'.join(ep.episodes)
-            title = '-'.join([showInfo[ep.identifier].seasonEps[x] for x in ep.episodes])
-            newFileName = '{1}x{2} - {3}' if short else '{0} - {1}x{2} - {3}'
+def journalDir(cacheDir):
+    from renamer.web import cache
 
-        except KeyError:
-            showFiles = [x for x in showFiles if x != ep]
+    return os.path.join(cacheDir if cacheDir else cache.defaultCacheDir(), 'journal')
+
+
+def replayJournal(args, logger):
+    from renamer import localpath
+
+    try:
+        if args.undo:
+            logger.info('Reverting {0}.'.format(args.undo))
+            done = localpath.journal.undo(args.undo)
 
         else:
-            ep.newFileName = newFileName.format(serie, ep.season, episode, title)
+            path = args.resume
+            if not path:
+                path = localpath.journal.latest(journalDir(args.cache_dir))
+            logger.info('Resuming {0}.'.format(path))
+            done = localpath.journal.resume(path)
+
+    except localpath.error.JournalError as err:
+        logger.error(err)
+        return 1
+
+    logger.info('{0} file(s) renamed.'.format(done))
+    return 0
+
+
+def showSkipped(args, logger):
+    from renamer.web import cache, error
+
+    try:
+        store = cache.Cache(args.cache_dir)
+
+    except error.CacheError as err:
+        logger.error(err)
+        return 1
+
+    if args.clear_skipped:
+        logger.info('{0} skipped entries cleared.'.format(store.clearNegatives()))
+    else:
+        for kind, key, reason, stored in store.negatives():
+            since = time.strftime('%Y-%m-%d %H:%M', time.localtime(stored))
+            print('{0}\t{1}\t{2}\t{3}'.format(since, kind, key, reason))
+
+    store.close()
+    return 0
+
+
+def printChanges(showFiles):
+    printableList = [
+        '--- {0}\n+++ {1}'.format(i.curFileName, i.newFileName)
+        for i in showFiles
+    ]
+    print("\n".join(printableList))
+
+
+def applyChanges(steps, args, logger):
+    from renamer import localpath
+
+    journal = None
+    try:
+        journal = localpath.Journal(journalDir(args.cache_dir))
+        journal.record(steps)
+
+    except localpath.error.JournalError as err:
+        logger.warn(err)
+        journal = None
+
+    try:
+        results = localpath.renameFiles(steps, args.jobs, journal)
+
+    except localpath.error.JournalError as err:
+        logger.error(err)
+        return 1
+
+    for ep, err in results:
+        if isinstance(err, localpath.error.SameFileError):
+            logger.warn(err)
+
+        elif isinstance(err, OSError):
+            strerr = "Can't rename {0} - {1}.".format(ep.curFileName, err.strerror or err)
+            logger.error(strerr)
+
+    if journal:
+        journal.close()
+    return 0
+
+
+def applyPlan(args, logger):
+    from renamer import plan
+
+    try:
+        steps = plan.loadPlan(args.apply)
+
+    except plan.error.PlanError as err:
+        logger.error(err)
+        return 1
+
+    printChanges(steps)
+    if not askApplyChanges(args.no_confirm):
+        return 0
+
+    return applyChanges(steps, args, logger)
+
+
+def runShards(args, showFiles, logger):
+    import tempfile
+    from renamer import plan, shard
+
+    shardDir = args.shard_dir if args.shard_dir else tempfile.mkdtemp(prefix='renamer-')
+    shards = shard.splitShards(showFiles, args.shards, shardDir)
+    argv = shard.workerArgs(args, len(shards))
+    logger.info('{0} shard(s) written to {1}.'.format(len(shards), shardDir))
+
+    if args.split_only:
+        print("\n".join(' '.join(shard.workerCommand(x, argv)) for x in shards))
+        return 0
+
+    results = shard.runShards(shards, argv)
+    shard.mergeLogs(results)
+    plans = [x.shard.plan for x in results if os.path.exists(x.shard.plan)]
+    if not plans:
+        return 1
+
+    try:
+        steps = plan.loadPlan(plans)
+        if args.plan:
+            count = plan.writePlan(args.plan, steps)
+            logger.info('{0} rename(s) written to {1}.'.format(count, args.plan))
+
+    except plan.error.PlanError as err:
+        logger.error(err)
+        return 1
+
+    printChanges(steps)
+    if args.plan or not askApplyChanges(args.no_confirm):
+        return 0
+
+    return applyChanges(steps, args, logger)
 
 
 def askApplyChanges(no_confirmation):
@@ -60,52 +189,135 @@ def askApplyChanges(no_confirmation):
     return True
 
 
-def main():
-    parser = cli.setParser()
-    args = parser.parse_args()
-    logger = setupLogger(args.loglevel)
+def setupTemplate(args, logger):
+    from renamer import plan
+
+    try:
+        defaultTemplate = plan.template.SIMPLE if args.simple else plan.template.DEFAULT
+        return plan.Template(args.format or defaultTemplate, args.sanitize)
+
+    except plan.error.TemplateError as err:
+        logger.error(err)
+        return None
+
+
+def listFiles(args):
+    from renamer import localpath, web
+
+    fileFilter = None
+    if args.ext or args.exclude or args.min_size:
+        fileFilter = localpath.FileFilter(args.ext, args.exclude, args.min_size)
+
+    if not args.no_cache:
+        web.setupCache(args.cache_dir, args.refresh)
+
+    try:
+        paths = localpath.readManifest(args.manifest) if args.manifest else args.path
+        return localpath.genFilesList(
+            paths, args.recursive, fileFilter, args.parse_workers, web.failedFiles()
+        )
+
+    except (FileNotFoundError, localpath.error.MatchNotFoundError):
+        return None
+
+
+def setupWeb(args, logger):
+    from renamer import web
+
+    web.setupClient(args.jobs, args.rate, args.offline)
+    try:
+        if args.catalog:
+            web.setupIndex(args.catalog)
+        if args.aliases:
+            web.setupAliases(args.aliases)
+
+    except (web.error.CatalogError, web.error.AliasError) as err:
+        logger.error(err)
+        return False
+
+    return True
+
+
+def lookupShows(args, showFiles):
+    from renamer import plan, web
+
+    try:
+        showGroups = plan.groupByShow(showFiles)
+        showInfo = web.genShowsDict([x[0] for x in showGroups.values()], args.jobs)
+
+    except web.error.NotFoundError:
+        return None, None
+
+    seasons = None if args.full_list else web.genSeasonsDict(showFiles)
+    web.populateShows(showInfo, args.jobs, seasons)
+    return showGroups, showInfo
+
+
+def savePlan(args, steps, logger):
+    from renamer import plan
 
     try:
-        showFiles = localpath.genFilesList(args.path, args.recursive)
-        showInfo = web.genShowsDict(showFiles)
+        count = plan.writePlan(args.plan, steps)
 
-    except FileNotFoundError as err:
+    except plan.error.PlanError as err:
+        logger.error(err)
         return 1
 
-    except localpath.error.MatchNotFoundError:
+    logger.info('{0} rename(s) written to {1}.'.format(count, args.plan))
+    return 0
+
+
+def renameShows(args, logger):
+    from renamer import plan
+
+    template = setupTemplate(args, logger)
+    if template is None:
         return 1
 
-    except web.error.NotFoundError as err:
+    showFiles = listFiles(args)
+    if showFiles is None:
         return 1
 
-    else:
-        web.populateShows(showInfo)
+    if args.shards > 1:
+        return runShards(args, showFiles, logger)
+
+    if not setupWeb(args, logger):
+        return 1
+
+    showGroups, showInfo = lookupShows(args, showFiles)
+    if showInfo is None:
+        return 1
 
     logger.info('Setting new filename(s).')
-    buildNewFileNames(showFiles, showInfo, args.simple)
-    showFiles.sort(key=lambda x: x.newFileName)
-    printableList = [
-        '--- {0}\n+++ {1}'.format(i.curFileName, i.newFileName)
-        for i in showFiles
-    ]
-    print("\n".join(printableList))
+    renamePlan = plan.buildPlan(showGroups, showInfo, template=template)
+    showFiles = sorted(renamePlan.resolved, key=lambda x: x.newFileName)
+    printChanges(showFiles)
+
+    if args.plan:
+        return savePlan(args, renamePlan.steps, logger)
 
     if not askApplyChanges(args.no_confirm):
         return 0
 
-    for ep in showFiles:
-        try:
-            ep.rename()
+    return applyChanges(renamePlan.steps, args, logger)
 
-        except localpath.error.SameFileError as err:
-            logger.warn(err)
 
-        except PermissionError as err:
-            strerr = "Can't rename {0} - {1}.".format(ep.curFileName, err.strerror)
-            logger.error(strerr)
+def main():
+    parser = cli.setParser()
+    args = parser.parse_args()
+    logger = setupLogger(args.loglevel, args.logfile)
 
-    return 0
+    if args.resume is not None or args.undo:
+        return replayJournal(args, logger)
+
+    if args.list_skipped or args.clear_skipped:
+        return showSkipped(args, logger)
+
+    if args.apply:
+        return applyPlan(args, logger)
+
+    return renameShows(args, logger)
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
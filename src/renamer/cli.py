@@ -16,6 +16,17 @@ from renamer import __version__
 #
 # Function
 #
+def fileSize(value):
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    try:
+        if value[-1:].upper() in units:
+            return int(float(value[:-1]) * units[value[-1:].upper()])
+        return int(value)
+
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid size: '{}'".format(value))
+
+
 def setParser():
     parser = argparse.ArgumentParser(prog='renamer')
     parser.add_argument(
@@ -36,12 +47,55 @@ def setParser():
         action='store_true',
         help='Omit show title from filename.'
     )
+    parser.add_argument(
+        '--format',
+        metavar='TEMPLATE',
+        default=None,
+        type=str,
+        help='Name files after TEMPLATE, using {show}, {season}, {episode}, {title} and {year}.'
+    )
+    parser.add_argument(
+        '--sanitize',
+        metavar='POLICY',
+        default='fold',
+        type=str,
+        choices=['fold', 'ascii', 'none'],
+        help='Replace accented letters in new names (fold, ascii, none).'
+    )
     parser.add_argument(
         '-r',
         '--recursive',
         action='store_true',
         help='Recursively descend into directories.'
     )
+    parser.add_argument(
+        '-e',
+        '--ext',
+        metavar='EXT',
+        action='append',
+        help='Only consider files with extension EXT (may be repeated or comma separated).'
+    )
+    parser.add_argument(
+        '-x',
+        '--exclude',
+        metavar='GLOB',
+        action='append',
+        help='Skip files and directories matching GLOB (may be repeated).'
+    )
+    parser.add_argument(
+        '--min-size',
+        metavar='SIZE',
+        default=0,
+        type=fileSize,
+        help='Skip files smaller than SIZE (K, M and G suffixes allowed).'
+    )
+    parser.add_argument(
+        '--parse-workers',
+        metavar='N',
+        default=1,
+        type=int,
+        help='Parse filenames in N worker processes.'
+    )
     parser.add_argument(
         '-l',
         '--loglevel',
@@ -52,10 +106,136 @@ def setParser():
         help='Set log level (INFO, WARN, ERROR).'
     )
     parser.add_argument(
-        'path',
+        '--logfile',
+        metavar='FILE',
+        default=None,
         type=str,
+        help='Write warnings and errors to FILE.'
+    )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        metavar='N',
+        default=4,
+        type=int,
+        help='Download information for up to N shows at once.'
+    )
+    parser.add_argument(
+        '--rate',
+        metavar='N',
+        default=2.0,
+        type=float,
+        help='Send at most N requests per second (0 for no limit).'
+    )
+    parser.add_argument(
+        '--full-list',
+        action='store_true',
+        help='Download the whole episodes list instead of single seasons.'
+    )
+    parser.add_argument(
+        '--catalog',
+        metavar='FILE',
+        default=None,
+        type=str,
+        help='Look shows up in the catalog FILE instead of searching TVmaze.'
+    )
+    parser.add_argument(
+        '--aliases',
         metavar='FILE',
+        default=None,
+        type=str,
+        help='Map show names to TVmaze show ids with the lines of FILE.'
+    )
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Never connect to TVmaze, only use the cache and the catalog.'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        metavar='DIR',
+        default=None,
+        type=str,
+        help='Store downloaded show information in DIR.'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not use the show information cache.'
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Ignore cached show information and download it again.'
+    )
+
+    parser.add_argument(
+        '--plan',
+        metavar='PLAN',
+        default=None,
+        type=str,
+        help='Write the renames to PLAN instead of applying them.'
+    )
+    parser.add_argument(
+        '--shards',
+        metavar='N',
+        default=1,
+        type=int,
+        help='Split the files by show into N shards, each handled by its own worker process.'
+    )
+    parser.add_argument(
+        '--shard-dir',
+        metavar='DIR',
+        default=None,
+        type=str,
+        help='Write shard manifests, plans and logs to DIR.'
+    )
+    parser.add_argument(
+        '--split-only',
+        action='store_true',
+        help='Only write the shard manifests and print the worker commands.'
+    )
+
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument(
+        '--resume',
+        metavar='JOURNAL',
+        nargs='?',
+        const='',
+        help='Finish an interrupted run from JOURNAL (default: the latest one).'
+    )
+    mode.add_argument(
+        '--undo',
+        metavar='JOURNAL',
+        help='Revert the renames recorded in JOURNAL.'
+    )
+    mode.add_argument(
+        '--apply',
+        metavar='PLAN',
         nargs='+',
+        help='Apply the renames from PLAN files, without looking anything up.'
+    )
+    mode.add_argument(
+        '--list-skipped',
+        action='store_true',
+        help='List the show names and files that are skipped after failing recently.'
+    )
+    mode.add_argument(
+        '--clear-skipped',
+        action='store_true',
+        help='Forget the show names and files that failed recently.'
+    )
+    mode.add_argument(
+        '--manifest',
+        metavar='MANIFEST',
+        help='Read the files to rename from MANIFEST instead of FILE.'
+    )
+    mode.add_argument(
+        'path',
+        type=str,
+        metavar='FILE',
+        nargs='*',
+        default=[],
         help='FILE location.'
     )
 
@@ -8,4 +8,9 @@
 #
 # Import
 #
-from .utils import traversePath, genFilesList
+from .filters import FileFilter
+from .journal import Journal
+from .utils import (
+    walkPath, traversePath, iterFiles, genFilesList, renameFiles,
+    writeManifest, readManifest
+)
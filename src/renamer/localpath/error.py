@@ -14,3 +14,7 @@ class MatchNotFoundError(Exception):
 
 class SameFileError(Exception):
     '''Raise when current filename and new filename are the same.'''
+
+
+class JournalError(Exception):
+    '''Raise when a rename journal can't be written, read or replayed.'''
@@ -0,0 +1,73 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+import os
+import re
+
+from fnmatch import translate
+
+
+#
+# Function
+#
+def _hasSep(pattern):
+    return '/' in pattern or os.sep in pattern
+
+
+def _compile(patterns):
+    patterns = [translate(x) for x in patterns]
+    return re.compile('|'.join(patterns)) if patterns else None
+
+
+#
+# Class
+#
+class FileFilter():
+    def __init__(self, extensions=None, exclude=None, minSize=0):
+        self._extensions = None
+        if extensions:
+            self._extensions = frozenset(
+                '.{}'.format(y.strip().lstrip('.').lower())
+                for x in extensions for y in x.split(',') if y.strip()
+            )
+
+        # Plain patterns match the name only, so a pattern like '*sample*'
+        # can't exclude everything under a root that happens to match it.
+        exclude = exclude or []
+        self._excludeName = _compile(x for x in exclude if not _hasSep(x))
+        self._excludePath = _compile(x for x in exclude if _hasSep(x))
+
+        self._minSize = minSize
+
+    def _isExcluded(self, path):
+        if self._excludeName and self._excludeName.match(os.path.basename(path)):
+            return True
+        return bool(self._excludePath and self._excludePath.match(path))
+
+    def acceptDir(self, path):
+        return not self._isExcluded(path)
+
+    def acceptFile(self, path, entry=None):
+        if self._extensions is not None:
+            if os.path.splitext(path)[-1].lower() not in self._extensions:
+                return False
+
+        if self._isExcluded(path):
+            return False
+
+        if self._minSize:
+            try:
+                size = entry.stat().st_size if entry else os.stat(path).st_size
+            except OSError:
+                return False
+            if size < self._minSize:
+                return False
+
+        return True
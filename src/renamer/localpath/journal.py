@@ -0,0 +1,231 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+import os
+import json
+import time
+import logging
+import threading
+
+from collections import namedtuple
+
+from . import error
+
+
+#
+# Global var
+#
+logger = logging.getLogger('Renamer.Files')
+
+Entry = namedtuple('Entry', ['dir', 'old', 'new'])
+
+SUFFIX = '.journal'
+KEEP = 50
+# Steps whose completion is written and synced at once.
+BATCH = 64
+
+
+#
+# Function
+#
+def _read(path):
+    entries = []
+    done = set()
+    state = None
+    try:
+        with open(path, encoding='UTF-8') as journalFile:
+            for line in journalFile:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn last line from an interrupted write.
+                    break
+                if 'state' in record:
+                    state = record['state']
+                elif 'done' in record:
+                    done.update(record['done'])
+                else:
+                    entries.append(Entry(record['dir'], record['old'], record['new']))
+
+    except OSError as err:
+        strerror = "Can't read journal {0} - {1}.".format(path, err.strerror)
+        raise error.JournalError(strerror)
+
+    return entries, done, state
+
+
+def _append(path, record):
+    with open(path, 'a', encoding='UTF-8') as journalFile:
+        journalFile.write(json.dumps(record) + '\n')
+        journalFile.flush()
+        os.fsync(journalFile.fileno())
+
+
+def _mark(path, state):
+    _append(path, {'state': state})
+
+
+def _journals(journalDir):
+    try:
+        names = [x for x in os.listdir(journalDir) if x.endswith(SUFFIX)]
+    except OSError:
+        return []
+    return [os.path.join(journalDir, x) for x in sorted(names)]
+
+
+def latest(journalDir):
+    for path in reversed(_journals(journalDir)):
+        if _read(path)[2] is None:
+            return path
+
+    raise error.JournalError("No unfinished journal found in {0}.".format(journalDir))
+
+
+def _move(src, dst):
+    # os.rename() silently replaces an existing target.
+    if os.path.lexists(dst):
+        logger.error("Can't rename {0} - {1} already exists.".format(
+            os.path.basename(src), os.path.basename(dst)
+        ))
+        return False
+
+    try:
+        os.rename(src, dst)
+
+    except OSError as err:
+        logger.error("Can't rename {0} - {1}.".format(os.path.basename(src), err.strerror))
+        return False
+
+    return True
+
+
+def resume(path):
+    entries, done, state = _read(path)
+    if state is not None:
+        raise error.JournalError("Journal {0} is already {1}.".format(path, state))
+
+    count = len(done)
+    for index, entry in enumerate(entries):
+        if index in done:
+            continue
+
+        src = os.path.join(entry.dir, entry.old)
+        dst = os.path.join(entry.dir, entry.new)
+        if os.path.lexists(src):
+            if _move(src, dst):
+                _append(path, {'done': [index]})
+                count += 1
+        elif os.path.lexists(dst):
+            # Renamed, but the crash came before its record was written.
+            count += 1
+        else:
+            logger.warn("Can't find {0} or {1}.".format(entry.old, entry.new))
+
+    _mark(path, 'complete')
+    return count
+
+
+def undo(path):
+    entries, _, state = _read(path)
+    if state == 'undone':
+        raise error.JournalError("Journal {0} is already undone.".format(path))
+
+    done = 0
+    for entry in reversed(entries):
+        src = os.path.join(entry.dir, entry.old)
+        dst = os.path.join(entry.dir, entry.new)
+        if os.path.lexists(dst) and not os.path.lexists(src):
+            done += _move(dst, src)
+        else:
+            logger.warn("Can't undo {0}, skipping.".format(entry.new))
+
+    _mark(path, 'undone')
+    return done
+
+
+#
+# Class
+#
+class Journal():
+    def __init__(self, journalDir, batch=BATCH):
+        name = 'renamer-{0}-{1}{2}'.format(time.strftime('%Y%m%d-%H%M%S'), os.getpid(), SUFFIX)
+        self._path = os.path.join(journalDir, name)
+        self._batch = batch
+        self._lock = threading.Lock()
+        self._steps = {}
+        self._pending = []
+        self._pendingNames = set()
+        try:
+            os.makedirs(journalDir, exist_ok=True)
+            self._file = open(self._path, 'a', encoding='UTF-8')
+
+        except OSError as err:
+            strerror = "Can't create journal {0} - {1}.".format(self._path, err.strerror)
+            raise error.JournalError(strerror)
+
+        for old in _journals(journalDir)[:-KEEP]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    @property
+    def path(self):
+        return self._path
+
+    def _write(self, lines):
+        try:
+            self._file.write(''.join(lines))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+        except OSError as err:
+            strerror = "Can't write journal {0} - {1}.".format(self._path, err.strerror)
+            raise error.JournalError(strerror)
+
+    def record(self, showFiles):
+        lines = []
+        with self._lock:
+            # Files already named right are never renamed, so there's nothing to replay.
+            for x in [y for y in showFiles if y.curFileName != y.newFileName]:
+                self._steps[id(x)] = len(self._steps)
+                lines.append(json.dumps(
+                    {'dir': x.dirName, 'old': x.curFileName, 'new': x.newFileName}
+                ) + '\n')
+            self._write(lines)
+
+    def _flush(self):
+        if self._pending:
+            self._write([json.dumps({'done': self._pending}) + '\n'])
+            self._pending = []
+            self._pendingNames = set()
+
+    def begin(self, step):
+        # A step that reuses a name touched by an unrecorded step must not run
+        # before that step is on disk, or resume couldn't tell them apart.
+        src = (step.dirName, step.curFileName)
+        dst = (step.dirName, step.newFileName)
+        with self._lock:
+            if src in self._pendingNames or dst in self._pendingNames:
+                self._flush()
+
+    def done(self, step):
+        with self._lock:
+            self._pending.append(self._steps[id(step)])
+            self._pendingNames.add((step.dirName, step.curFileName))
+            self._pendingNames.add((step.dirName, step.newFileName))
+            if len(self._pending) >= self._batch:
+                self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+        self._file.close()
+        _mark(self._path, 'complete')
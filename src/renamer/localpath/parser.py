@@ -0,0 +1,182 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+import re
+import sys
+
+from functools import lru_cache
+from collections import namedtuple
+from itertools import zip_longest
+
+from . import error
+
+
+#
+# Global var
+#
+ShowInfo = namedtuple('ShowInfo', ['title', 'country', 'year', 'season', 'episodes'])
+ShowName = namedtuple('ShowName', ['title', 'country', 'year', 'identifier'])
+
+NAME_CACHE_SIZE = 4096
+
+# One alternative per layout, tried in priority order: scene (S01E02),
+# preformatted (01x02) and alternative numeric (.102.).  Each one is
+# anchored with a lazy prefix, so the first layout that matches anywhere
+# in the filename wins, just like trying the patterns one after another.
+reLayout = re.compile(
+    r'^(?:'
+    r'(?P<scene>.*?)[ .][Ss](?P<sceneSeason>\d{2})(?P<sceneInfo>(?:[Ee]\d{2}-?)+)[ .]'
+    r'|(?P<pre>.*?) (?P<preSeason>\d{2})x(?P<preInfo>(?:\d{2}-?)+) '
+    r'|(?P<alt>.*?)\.(?P<altYear>\d{4}.)?(?P<altInfo>\d{3,})\.'
+    r')',
+    re.S
+)
+reEpisodes = re.compile(r'\d{2}')
+
+reSep = re.compile(r'[\W]+')
+reYear = re.compile('[12][0-9]{3}')
+reCountry = re.compile('[A-Z]{2}')
+reIdentifier = re.compile(r'\W')
+
+COUNTRY_CODES = frozenset([
+    'AD', 'AE', 'AF', 'AG', 'AI', 'AL', 'AM', 'AO', 'AQ', 'AR', 'AS',
+    'AT', 'AU', 'AW', 'AX', 'AZ', 'BA', 'BB', 'BD', 'BE', 'BF', 'BG',
+    'BH', 'BI', 'BJ', 'BL', 'BM', 'BN', 'BO', 'BQ', 'BR', 'BS', 'BT',
+    'BV', 'BW', 'BY', 'BZ', 'CA', 'CC', 'CD', 'CF', 'CG', 'CH', 'CI',
+    'CK', 'CL', 'CM', 'CN', 'CO', 'CR', 'CU', 'CV', 'CW', 'CX', 'CY',
+    'CZ', 'DE', 'DJ', 'DK', 'DM', 'DO', 'DZ', 'EC', 'EE', 'EG', 'EH',
+    'ER', 'ES', 'ET', 'FI', 'FJ', 'FK', 'FM', 'FO', 'FR', 'GA', 'UK',
+    'GD', 'GE', 'GF', 'GG', 'GH', 'GI', 'GL', 'GM', 'GN', 'GP', 'GQ',
+    'GR', 'GS', 'GT', 'GU', 'GW', 'GY', 'HK', 'HM', 'HN', 'HR', 'HT',
+    'HU', 'ID', 'IE', 'IL', 'IM', 'IN', 'IO', 'IQ', 'IR', 'IS', 'IT',
+    'JE', 'JM', 'JO', 'JP', 'KE', 'KG', 'KH', 'KI', 'KM', 'KN', 'KP',
+    'KR', 'KW', 'KY', 'KZ', 'LA', 'LB', 'LC', 'LI', 'LK', 'LR', 'LS',
+    'LT', 'LU', 'LV', 'LY', 'MA', 'MC', 'MD', 'ME', 'MF', 'MG', 'MH',
+    'MK', 'ML', 'MM', 'MN', 'MO', 'MP', 'MQ', 'MR', 'MS', 'MT', 'MU',
+    'MV', 'MW', 'MX', 'MY', 'MZ', 'NA', 'NC', 'NE', 'NF', 'NG', 'NI',
+    'NL', 'NO', 'NP', 'NR', 'NU', 'NZ', 'OM', 'PA', 'PE', 'PF', 'PG',
+    'PH', 'PK', 'PL', 'PM', 'PN', 'PR', 'PS', 'PT', 'PW', 'PY', 'QA',
+    'RE', 'RO', 'RS', 'RU', 'RW', 'SA', 'SB', 'SC', 'SD', 'SE', 'SG',
+    'SH', 'SI', 'SJ', 'SK', 'SL', 'SM', 'SN', 'SO', 'SR', 'SS', 'ST',
+    'SV', 'SX', 'SY', 'SZ', 'TC', 'TD', 'TF', 'TG', 'TH', 'TJ', 'TK',
+    'TL', 'TM', 'TN', 'TO', 'TR', 'TT', 'TW', 'TZ', 'UA', 'UG', 'UM',
+    'US', 'UY', 'UZ', 'VA', 'VC', 'VE', 'VG', 'VI', 'VN', 'VU', 'WF',
+    'WS', 'YE', 'YT', 'ZA', 'ZM', 'ZW'
+])
+
+
+#
+# Function
+#
+def formatName(name):
+    country = year = None
+    tmp = name
+
+    match = reCountry.search(name)
+    if match and match.group() in COUNTRY_CODES:
+        country = 'GB' if match.group() == 'UK' else match.group()
+        tmp = reCountry.sub('', name)
+
+    match = reYear.search(name)
+    if match:
+        year = match.group()
+
+    nameOnly = reSep.sub(' ', reYear.sub('', tmp)).strip()
+    return {
+        'title': nameOnly.title(),
+        'country': country,
+        'year': year
+    }
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def identifier(title):
+    return sys.intern(reIdentifier.sub('', title).upper())
+
+
+def _intern(value):
+    return sys.intern(value) if value else value
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalize(fragment):
+    info = formatName(fragment)
+    title = sys.intern(info['title'])
+    return ShowName(
+        title=title,
+        country=_intern(info['country']),
+        year=_intern(info['year']),
+        identifier=identifier(title)
+    )
+
+
+def cacheInfo():
+    return normalize.cache_info()
+
+
+def clearCache():
+    normalize.cache_clear()
+    identifier.cache_clear()
+
+
+def showInfo(title, country, year, season, episodes):
+    # Files of the same show share one copy of every string.
+    return ShowInfo(
+        title=_intern(title),
+        country=_intern(country),
+        year=_intern(year),
+        season=_intern(season),
+        episodes=[sys.intern(x) for x in episodes]
+    )
+
+
+def _altEpisodes(info):
+    info_lst = list(info)
+    info_lst.reverse()
+    info_itr = [iter(info_lst)] * 2
+    info_grp = zip_longest(*info_itr, fillvalue='0')
+    info_lst = list(info_grp)
+    s_num, s_dec = info_lst.pop()
+    info_lst.reverse()
+
+    season = '{}{}'.format(s_dec, s_num)
+    eps = ['{}{}'.format(e_dec, e_num) for e_num, e_dec in info_lst]
+    return season, eps
+
+
+def parse(filename):
+    match = reLayout.match(filename)
+    if not match:
+        strerror = "Can't find show pattern for {}".format(filename)
+        raise error.MatchNotFoundError(strerror)
+
+    if match.group('scene') is not None:
+        show = match.group('scene')
+        season = match.group('sceneSeason')
+        eps = reEpisodes.findall(match.group('sceneInfo'))
+
+    elif match.group('pre') is not None:
+        show = match.group('pre')
+        season = match.group('preSeason')
+        eps = reEpisodes.findall(match.group('preInfo'))
+
+    else:
+        year = match.group('altYear')
+        show = '{}{}'.format(match.group('alt'), year) if year else match.group('alt')
+        season, eps = _altEpisodes(match.group('altInfo'))
+
+    name = normalize(show)
+    return ShowInfo(
+        title=name.title,
+        country=name.country,
+        year=name.year,
+        season=sys.intern('{:0>2}'.format(season)),
+        episodes=[sys.intern(x) for x in eps]
+    )
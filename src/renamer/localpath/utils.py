@@ -9,9 +9,14 @@
 # Import
 #
 import os
+import json
 import logging
 
-from . import types, error
+from itertools import chain
+from collections import namedtuple, deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from . import types, error, parser
 
 
 #
@@ -19,52 +24,238 @@ from . import types, error
 #
 logger = logging.getLogger('Renamer.Files')
 
+RenameResult = namedtuple('RenameResult', ['file', 'error'])
+
+CHUNK_SIZE = 1000
+
 
 #
 # Function
 #
-def traversePath(path, recursive):
-    filesList = []
-    for path in [os.path.abspath(x) for x in path if os.path.exists(x)]:
-        if recursive and os.path.isdir(path):
-            logger.info('Descending into {0}.'.format(path))
-            tmp = []
-            tree = [(x, y) for x, _, y in os.walk(path) if y]
-            for root, files in tree:
-                tmp.extend(map((lambda x: os.path.join(root, x)), files))
+def _scanTree(top, recursive, fileFilter):
+    pending = [top]
+    while pending:
+        dirPath = pending.pop()
+        subDirs = []
+        try:
+            for entry in os.scandir(dirPath):
+                if not entry.is_dir():
+                    if not fileFilter or fileFilter.acceptFile(entry.path, entry):
+                        yield entry.path
 
-        elif os.path.isdir(path):
-            logger.info('Entering {0}.'.format(path))
-            tmp = map((lambda x: os.path.join(path, x)), os.listdir(path))
+                elif recursive and not entry.is_symlink():
+                    if not fileFilter or fileFilter.acceptDir(entry.path):
+                        subDirs.append(entry.path)
 
-        else:
-            logger.info('Listing {0}.'.format(path))
-            tmp = [path]
+        except OSError as err:
+            logger.warn("Can't list {0} - {1}.".format(dirPath, err.strerror))
+
+        pending.extend(reversed(subDirs))
 
-        filesList.extend(tmp)
 
+def _walkRoot(path, recursive, fileFilter):
+    if os.path.isdir(path):
+        strlog = 'Descending into {0}.' if recursive else 'Entering {0}.'
+        logger.info(strlog.format(path))
+        yield from _scanTree(path, recursive, fileFilter)
+
+    elif not fileFilter or fileFilter.acceptFile(path):
+        logger.info('Listing {0}.'.format(path))
+        yield path
+
+
+def walkPath(path, recursive=False, fileFilter=None):
+    # Overlapping arguments, like a file and its directory, list a file once.
+    # Symlinked directories aren't followed, so resolving the root is enough.
+    seen = set()
+    for path in [os.path.abspath(x) for x in path if os.path.exists(x)]:
+        realPath = os.path.realpath(path)
+        for entry in _walkRoot(path, recursive, fileFilter):
+            key = realPath + entry[len(path):]
+            if key not in seen:
+                seen.add(key)
+                yield entry
+
+
+def traversePath(path, recursive, fileFilter=None):
+    filesList = list(walkPath(path, recursive, fileFilter))
     if not filesList:
         raise FileNotFoundError("File(s) not found.")
 
     return filesList
 
 
-def genFilesList(path, recursive=False):
-    filesList = traversePath(path, recursive)
+def _parseChunk(names):
+    results = []
+    for name in names:
+        try:
+            results.append(tuple(parser.parse(name)))
+
+        except error.MatchNotFoundError:
+            results.append(None)
+
+    return results
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def fileKey(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return '{0}:{1}:{2}'.format(path, st.st_size, st.st_mtime_ns)
+
+
+def _skipFailed(entries, failures, keys):
+    for entry in entries:
+        # Only paths that failed before are worth a stat.
+        if failures.hasPath(entry):
+            key = keys[entry] = fileKey(entry)
+            if key is not None and key in failures:
+                strlog = "Skipping {0}, its name couldn't be parsed before."
+                logger.info(strlog.format(os.path.basename(entry)))
+                continue
+        yield entry
+
+
+def _recordFailure(failures, entry, reason, keys):
+    if failures is None:
+        return
+    key = keys.pop(entry) if entry in keys else fileKey(entry)
+    if key is not None:
+        failures.add(key, reason)
+
+
+def _collectChunk(chunk, job, failures, keys):
+    for entry, showInfo in zip(chunk, job.result()):
+        name = os.path.basename(entry)
+        logger.info('Trying to match patterns to {0}.'.format(name))
+        if showInfo is None:
+            strerror = "Can't find show pattern for {}".format(name)
+            logger.warn(strerror)
+            _recordFailure(failures, entry, strerror, keys)
+        else:
+            yield types.SerieFile(entry, showInfo)
+
 
-    showFiles = []
-    for entry in [x for x in filesList if not os.path.isdir(x)]:
+def _iterFilesParallel(entries, workers, failures, keys):
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunks(entries, CHUNK_SIZE):
+            names = [os.path.basename(x) for x in chunk]
+            pending.append((chunk, executor.submit(_parseChunk, names)))
+            if len(pending) > workers * 2:
+                yield from _collectChunk(*pending.popleft(), failures=failures, keys=keys)
+
+        while pending:
+            yield from _collectChunk(*pending.popleft(), failures=failures, keys=keys)
+
+
+def _iterFilesSerial(entries, failures, keys):
+    for entry in entries:
         try:
             logger.info('Trying to match patterns to {0}.'.format(os.path.basename(entry)))
             fileObj = types.SerieFile(entry)
 
         except error.MatchNotFoundError as err:
             logger.warn(err)
+            _recordFailure(failures, entry, str(err), keys)
 
         else:
-            showFiles.append(fileObj)
+            yield fileObj
+
+
+def iterFiles(path, recursive=False, fileFilter=None, workers=1, failures=None):
+    entries = walkPath(path, recursive, fileFilter)
+    first = next(entries, None)
+    if first is None:
+        raise FileNotFoundError("File(s) not found.")
 
+    entries = chain([first], entries)
+    # failures holds the keys of files that couldn't be parsed on earlier
+    # runs; anything with 'in', hasPath(path) and add(key, reason) will do.
+    keys = {}
+    if failures:
+        entries = _skipFailed(entries, failures, keys)
+
+    if workers > 1:
+        yield from _iterFilesParallel(entries, workers, failures, keys)
+    else:
+        yield from _iterFilesSerial(entries, failures, keys)
+
+
+def genFilesList(path, recursive=False, fileFilter=None, workers=1, failures=None):
+    showFiles = list(iterFiles(path, recursive, fileFilter, workers, failures))
     if not showFiles:
         raise error.MatchNotFoundError("No valid filename(s) found.")
 
     return showFiles
+
+
+def writeManifest(path, showFiles):
+    with open(path, 'w', encoding='UTF-8') as manifest:
+        for ep in showFiles:
+            manifest.write(json.dumps({'path': os.path.join(ep.dirName, ep.curFileName)}) + '\n')
+
+
+def readManifest(path):
+    with open(path, encoding='UTF-8') as manifest:
+        return [json.loads(x)['path'] for x in manifest if x.strip()]
+
+
+def _openDir(dirName):
+    if os.rename not in os.supports_dir_fd:
+        return None
+    return os.open(dirName or os.curdir, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+
+
+def _renameDir(dirName, files, journal=None):
+    results = []
+    try:
+        dirFd = _openDir(dirName)
+
+    except OSError as err:
+        return [RenameResult(file=ep, error=err) for ep in files]
+
+    try:
+        for ep in files:
+            try:
+                if journal:
+                    journal.begin(ep)
+                ep.rename(dirFd)
+
+            except (error.SameFileError, OSError) as err:
+                results.append(RenameResult(file=ep, error=err))
+
+            else:
+                if journal:
+                    journal.done(ep)
+                results.append(RenameResult(file=ep, error=None))
+
+    finally:
+        if dirFd is not None:
+            os.close(dirFd)
+
+    return results
+
+
+def renameFiles(showFiles, jobs=1, journal=None):
+    dirs = OrderedDict()
+    for ep in showFiles:
+        dirs.setdefault(ep.dirName, []).append(ep)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        jobsList = [executor.submit(_renameDir, x, y, journal) for x, y in dirs.items()]
+        return [result for job in jobsList for result in job.result()]
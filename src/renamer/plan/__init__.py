@@ -0,0 +1,12 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+from .utils import groupByShow, buildPlan, scheduleRenames, writePlan, loadPlan
+from .template import Template
@@ -0,0 +1,16 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Exception
+#
+class PlanError(Exception):
+    '''Raise when a plan file can't be written, read or safely applied.'''
+
+
+class TemplateError(Exception):
+    '''Raise when a filename template or sanitize policy is invalid.'''
@@ -0,0 +1,116 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+import unicodedata
+
+from string import Formatter
+
+from . import error
+
+
+#
+# Global var
+#
+DEFAULT = '{show} - {season}x{episode} - {title}'
+SIMPLE = '{season}x{episode} - {title}'
+
+FIELDS = frozenset(['show', 'season', 'episode', 'title', 'year'])
+
+FOLD_TABLE = str.maketrans({
+    'á': 'a',
+    'à': 'a',
+    'ã': 'a',
+    'â': 'a',
+    'é': 'e',
+    'è': 'e',
+    'ẽ': 'e',
+    'ê': 'e',
+    'í': 'i',
+    'ì': 'i',
+    'ĩ': 'i',
+    'î': 'i',
+    'ó': 'o',
+    'ò': 'o',
+    'õ': 'o',
+    'ô': 'o',
+    'ú': 'u',
+    'ù': 'u',
+    'ũ': 'u',
+    'û': 'u',
+    'ç': 'c',
+    'ñ': 'n'
+})
+
+
+#
+# Function
+#
+def _asciiTable():
+    table = {
+        ord('ß'): 'ss',
+        ord('æ'): 'ae',
+        ord('Æ'): 'AE',
+        ord('œ'): 'oe',
+        ord('Œ'): 'OE',
+        ord('ø'): 'o',
+        ord('Ø'): 'O',
+        ord('đ'): 'd',
+        ord('Đ'): 'D',
+        ord('ł'): 'l',
+        ord('Ł'): 'L'
+    }
+    for code in list(range(0xC0, 0x250)) + list(range(0x1E00, 0x1F00)):
+        if code in table:
+            continue
+        folded = unicodedata.normalize('NFKD', chr(code)).encode('ascii', 'ignore').decode()
+        if folded:
+            table[code] = folded
+    return table
+
+
+POLICIES = {
+    'fold': FOLD_TABLE,
+    'ascii': _asciiTable(),
+    'none': {}
+}
+
+
+#
+# Class
+#
+class Template():
+    def __init__(self, template=DEFAULT, policy='fold'):
+        try:
+            fields = [x[1] for x in Formatter().parse(template) if x[1] is not None]
+
+        except ValueError as err:
+            raise error.TemplateError("Invalid template '{0}' - {1}.".format(template, err))
+
+        unknown = [x for x in fields if x not in FIELDS]
+        if unknown:
+            strerror = "Unknown field '{0}' in template '{1}'.".format(unknown[0], template)
+            raise error.TemplateError(strerror)
+
+        if policy not in POLICIES:
+            raise error.TemplateError("Unknown sanitize policy '{0}'.".format(policy))
+
+        self._template = template
+        self._format = template.format
+        self._table = POLICIES[policy]
+
+    @property
+    def template(self):
+        return self._template
+
+    def format(self, show, season, episode, title, year=None):
+        name = self._format(
+            show=show, season=season, episode=episode, title=title, year=year if year else ''
+        )
+        return name.translate(self._table)
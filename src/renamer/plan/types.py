@@ -0,0 +1,48 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+from collections import namedtuple
+
+
+#
+# Global var
+#
+Unresolved = namedtuple('Unresolved', ['file', 'reason'])
+
+
+#
+# Class
+#
+class Plan():
+    def __init__(self):
+        self._resolved = []
+        self._unresolved = []
+        self._steps = []
+
+    @property
+    def resolved(self):
+        return self._resolved
+
+    @property
+    def unresolved(self):
+        return self._unresolved
+
+    @property
+    def steps(self):
+        return self._steps
+
+    def resolve(self, ep):
+        self._resolved.append(ep)
+
+    def reject(self, ep, reason):
+        self._unresolved.append(Unresolved(file=ep, reason=reason))
+
+    def schedule(self, steps):
+        self._steps = steps
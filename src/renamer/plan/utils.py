@@ -0,0 +1,269 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+import os
+import json
+import logging
+
+from collections import OrderedDict
+
+from renamer.web import error as webError
+from renamer.localpath import types as localTypes
+
+from . import types, error, template as nameTemplate
+
+
+#
+# Global var
+#
+logger = logging.getLogger('Renamer.Plan')
+
+
+#
+# Function
+#
+def groupByShow(showFiles):
+    groups = OrderedDict()
+    for ep in showFiles:
+        groups.setdefault(ep.identifier, []).append(ep)
+    return groups
+
+
+def _episodeTitle(show, ep):
+    return '-'.join([show.episodeTitle(ep.season, x) for x in ep.episodes])
+
+
+def _tempName(ep, taken):
+    count = 0
+    while True:
+        name = '.renamer-{0}-{1}{2}'.format(os.getpid(), count, ep.fileNameExt)
+        if name not in taken:
+            return name
+        count += 1
+
+
+def _rejectConflicts(moving, existing, rejected):
+    bySource = {ep.curFileName: ep for ep in moving}
+    byTarget = {}
+    for ep in moving:
+        byTarget.setdefault(ep.newFileName, []).append(ep)
+
+    pending = []
+    for target, eps in byTarget.items():
+        if len(eps) > 1:
+            reason = '{0} file(s) would be renamed to {1}.'.format(len(eps), target)
+            pending.extend((ep, reason) for ep in eps)
+        elif target in existing and target not in bySource:
+            pending.append((eps[0], '{0} already exists.'.format(target)))
+
+    # A file left in place keeps its name taken, so whatever targets it conflicts too.
+    while pending:
+        ep, reason = pending.pop()
+        if id(ep) in rejected:
+            continue
+        logger.warn("Can't rename {0} - {1}".format(ep.curFileName, reason))
+        rejected[id(ep)] = reason
+        bySource.pop(ep.curFileName, None)
+        for other in byTarget.get(ep.curFileName, []):
+            pending.append((other, '{0} already exists.'.format(ep.curFileName)))
+
+    return bySource
+
+
+def _orderChains(remaining, bySource, visited):
+    # The file holding a target name must move before the file that wants it.
+    steps = []
+    targets = set(ep.newFileName for ep in remaining)
+    for ep in [x for x in remaining if x.curFileName not in targets]:
+        chain = []
+        node = ep
+        while node is not None:
+            visited.add(id(node))
+            chain.append(node)
+            node = bySource.get(node.newFileName)
+        steps.extend(reversed(chain))
+    return steps
+
+
+def _breakCycles(dirName, remaining, bySource, taken, visited):
+    # Park one file of each cycle under a temporary name to break the loop.
+    steps = []
+    for ep in remaining:
+        if id(ep) in visited:
+            continue
+        cycle = []
+        node = ep
+        while id(node) not in visited:
+            visited.add(id(node))
+            cycle.append(node)
+            node = bySource[node.newFileName]
+
+        temp = _tempName(ep, taken)
+        taken.add(temp)
+        steps.append(localTypes.RenameStep(os.path.join(dirName, ep.curFileName), temp))
+        steps.extend(reversed(cycle[1:]))
+        steps.append(localTypes.RenameStep(os.path.join(dirName, temp), ep.newFileName))
+    return steps
+
+
+def _scheduleDir(dirName, files, rejected):
+    try:
+        existing = set(os.listdir(dirName or os.curdir))
+    except OSError:
+        existing = set()
+
+    moving = [ep for ep in files if ep.curFileName != ep.newFileName]
+    bySource = _rejectConflicts(moving, existing, rejected)
+
+    remaining = [ep for ep in moving if id(ep) not in rejected]
+    taken = existing | set(ep.newFileName for ep in remaining)
+    visited = set()
+    steps = [ep for ep in files if ep.curFileName == ep.newFileName]
+    steps.extend(_orderChains(remaining, bySource, visited))
+    steps.extend(_breakCycles(dirName, remaining, bySource, taken, visited))
+    return steps
+
+
+def scheduleRenames(plan, showFiles):
+    dirs = OrderedDict()
+    for ep in showFiles:
+        dirs.setdefault(ep.dirName, []).append(ep)
+
+    rejected = {}
+    steps = []
+    for dirName, files in dirs.items():
+        steps.extend(_scheduleDir(dirName, files, rejected))
+
+    for ep in showFiles:
+        if id(ep) in rejected:
+            plan.reject(ep, rejected[id(ep)])
+        else:
+            plan.resolve(ep)
+    plan.schedule(steps)
+
+
+def buildPlan(groups, showInfo, short=False, template=None):
+    plan = types.Plan()
+    named = []
+    if template is None:
+        template = nameTemplate.Template(nameTemplate.SIMPLE if short else nameTemplate.DEFAULT)
+
+    for identifier, files in groups.items():
+        show = showInfo.get(identifier)
+        if not show:
+            logger.warn('Skipping {0} file(s) of {1}.'.format(len(files), files[0].title.upper()))
+            for ep in files:
+                plan.reject(ep, 'Show not found.')
+            continue
+
+        for ep in files:
+            try:
+                title = _episodeTitle(show, ep)
+
+            except (KeyError, webError.DownloadError):
+                strerr = "Can't find episode {0}x{1} of {2}, skipping {3}.".format(
+                    ep.season, '-'.join(ep.episodes), show.title, ep.curFileName
+                )
+                logger.warn(strerr)
+                plan.reject(ep, 'Episode not found.')
+
+            else:
+                episode = '-'.join(ep.episodes)
+                ep.newFileName = template.format(show.title, ep.season, episode, title, show.year)
+                named.append(ep)
+
+    scheduleRenames(plan, named)
+    return plan
+
+
+def _fingerprint(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None, None
+    return st.st_size, st.st_mtime_ns
+
+
+def writePlan(path, steps):
+    lines = []
+    for step in [x for x in steps if x.curFileName != x.newFileName]:
+        size, mtime = _fingerprint(os.path.join(step.dirName, step.curFileName))
+        lines.append(json.dumps({
+            'dir': step.dirName,
+            'old': step.curFileName,
+            'new': step.newFileName,
+            'size': size,
+            'mtime': mtime
+        }) + '\n')
+
+    try:
+        with open(path + '.tmp', 'w', encoding='UTF-8') as planFile:
+            planFile.write(''.join(lines))
+        os.replace(path + '.tmp', path)
+
+    except OSError as err:
+        raise error.PlanError("Can't write plan {0} - {1}.".format(path, err.strerror))
+
+    return len(lines)
+
+
+def _readPlan(path):
+    try:
+        with open(path, encoding='UTF-8') as planFile:
+            return [json.loads(x) for x in planFile if x.strip()]
+
+    except OSError as err:
+        raise error.PlanError("Can't read plan {0} - {1}.".format(path, err.strerror))
+
+    except ValueError:
+        raise error.PlanError("Plan {0} is corrupted.".format(path))
+
+
+def _dropConflicts(steps):
+    # Replay the steps against each directory's listing: plans made apart
+    # (shards, several plan files) or a file created since planning must
+    # not let one rename replace another file.
+    names = {}
+    safe = []
+    for step in steps:
+        if step.dirName not in names:
+            try:
+                names[step.dirName] = set(os.listdir(step.dirName or os.curdir))
+            except OSError:
+                names[step.dirName] = set()
+
+        taken = names[step.dirName]
+        if step.newFileName in taken:
+            reason = '{0} already exists.'.format(step.newFileName)
+            logger.warn("Can't rename {0} - {1}".format(step.curFileName, reason))
+            continue
+
+        taken.discard(step.curFileName)
+        taken.add(step.newFileName)
+        safe.append(step)
+
+    return safe
+
+
+def loadPlan(paths):
+    steps = []
+    changed = 0
+    for path in paths:
+        for entry in _readPlan(path):
+            src = os.path.join(entry['dir'], entry['old'])
+            if entry['size'] is not None and _fingerprint(src) != (entry['size'], entry['mtime']):
+                logger.warn('{0} changed since the plan was made.'.format(src))
+                changed += 1
+            steps.append(localTypes.RenameStep(src, entry['new']))
+
+    if changed:
+        raise error.PlanError("{0} file(s) changed, refusing to apply the plan.".format(changed))
+
+    return _dropConflicts(steps)
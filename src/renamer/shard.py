@@ -0,0 +1,130 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+import os
+import sys
+import zlib
+import logging
+import subprocess
+
+from collections import namedtuple
+
+from renamer import localpath
+
+
+#
+# Global var
+#
+logger = logging.getLogger('Renamer.Shard')
+
+Shard = namedtuple('Shard', ['manifest', 'plan', 'log', 'output'])
+ShardResult = namedtuple('ShardResult', ['shard', 'returncode'])
+
+# Options forwarded to the workers, as (dest, option) pairs.
+FLAGS = [
+    ('simple', '-s'),
+    ('full_list', '--full-list'),
+    ('offline', '--offline'),
+    ('no_cache', '--no-cache'),
+    ('refresh', '--refresh'),
+]
+OPTIONS = [
+    ('format', '--format'),
+    ('sanitize', '--sanitize'),
+    ('parse_workers', '--parse-workers'),
+    ('cache_dir', '--cache-dir'),
+]
+# Workers may run from elsewhere, so these are made absolute.
+PATHS = [
+    ('catalog', '--catalog'),
+    ('aliases', '--aliases'),
+]
+
+
+#
+# Function
+#
+def shardIndex(identifier, count):
+    return zlib.crc32(identifier.encode('UTF-8')) % count
+
+
+def splitShards(showFiles, count, shardDir):
+    buckets = [[] for _ in range(count)]
+    for ep in showFiles:
+        buckets[shardIndex(ep.identifier, count)].append(ep)
+
+    os.makedirs(shardDir, exist_ok=True)
+    shards = []
+    for index, files in enumerate(buckets):
+        if not files:
+            continue
+        base = os.path.join(shardDir, 'shard-{0:03}'.format(index))
+        shard = Shard(
+            manifest='{}.manifest'.format(base),
+            plan='{}.plan'.format(base),
+            log='{}.log'.format(base),
+            output='{}.out'.format(base)
+        )
+        localpath.writeManifest(shard.manifest, files)
+        shards.append(shard)
+
+    return shards
+
+
+def workerArgs(args, count):
+    argv = ['-y', '-l', args.loglevel, '-j', str(args.jobs)]
+    argv.extend(['--rate', str(args.rate / count)])
+    argv.extend(option for dest, option in FLAGS if getattr(args, dest))
+    for dest, option in OPTIONS:
+        value = getattr(args, dest)
+        if value:
+            argv.extend([option, str(value)])
+    for dest, option in PATHS:
+        value = getattr(args, dest)
+        if value:
+            argv.extend([option, os.path.abspath(value)])
+    return argv
+
+
+def workerCommand(shard, argv):
+    command = [sys.executable, '-m', 'renamer']
+    command.extend(argv)
+    command.extend(['--logfile', shard.log, '--plan', shard.plan, '--manifest', shard.manifest])
+    return command
+
+
+def runShards(shards, argv):
+    running = []
+    for shard in shards:
+        logger.info('Starting worker for {0}.'.format(os.path.basename(shard.manifest)))
+        with open(shard.output, 'w') as output:
+            process = subprocess.Popen(
+                workerCommand(shard, argv),
+                stdout=output,
+                stderr=subprocess.STDOUT
+            )
+        running.append((shard, process))
+
+    return [ShardResult(shard=x, returncode=y.wait()) for x, y in running]
+
+
+def mergeLogs(results):
+    for shard, returncode in results:
+        name = os.path.basename(shard.manifest)
+        try:
+            with open(shard.log, encoding='UTF-8') as logFile:
+                for line in logFile:
+                    logger.warn('{0}: {1}'.format(name, line.rstrip('\n')))
+
+        except OSError:
+            pass
+
+        if returncode:
+            logger.error('Worker for {0} exited with status {1}.'.format(name, returncode))
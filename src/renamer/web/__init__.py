@@ -8,4 +8,7 @@
 #
 # Import
 #
-from .utils import genShowsDict, populateShows
+from .utils import (
+    setupCache, setupClient, setupIndex, setupAliases, failedFiles, genShowsDict,
+    genSeasonsDict, populateShows
+)
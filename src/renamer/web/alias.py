@@ -0,0 +1,62 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+import re
+
+from renamer.localpath import parser
+
+from . import error
+
+
+#
+# Global var
+#
+reAlias = re.compile(r'^(?P<name>.+?)\s*=\s*(?P<id>\d+)$')
+
+
+#
+# Function
+#
+def aliasKey(title, country=None, year=None):
+    return parser.identifier(title), year or '', country or ''
+
+
+def loadAliases(path):
+    aliases = {}
+    try:
+        with open(path, encoding='UTF-8') as aliasFile:
+            for number, line in enumerate(aliasFile, 1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+
+                match = reAlias.match(line)
+                if not match:
+                    strerror = "Invalid alias on line {0} of {1}.".format(number, path)
+                    raise error.AliasError(strerror)
+
+                info = parser.formatName(match.group('name'))
+                key = aliasKey(info['title'], info['country'], info['year'])
+                aliases[key] = int(match.group('id'))
+
+    except OSError as err:
+        raise error.AliasError("Can't read aliases {0} - {1}.".format(path, err.strerror))
+
+    return aliases
+
+
+def findAlias(aliases, title, country=None, year=None):
+    identifier, year, country = aliasKey(title, country, year)
+    # The most specific alias wins.
+    for key in [(year, country), (year, ''), ('', country), ('', '')]:
+        showId = aliases.get((identifier,) + key)
+        if showId is not None:
+            return showId
+    return None
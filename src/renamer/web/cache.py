@@ -0,0 +1,330 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+import os
+import time
+import sqlite3
+import logging
+import platform
+import threading
+
+from collections import namedtuple
+
+from . import error
+
+
+#
+# Global var
+#
+logger = logging.getLogger('Renamer.Web')
+
+SCHEMA_VERSION = 2
+
+Entry = namedtuple('Entry', ['data', 'etag', 'modified'])
+Negative = namedtuple('Negative', ['kind', 'key', 'reason', 'stored'])
+
+# Seconds an entry stays fresh, per entry type.
+TTL = {
+    'search': 7 * 24 * 60 * 60,
+    'show': 7 * 24 * 60 * 60,
+    'seasons': 24 * 60 * 60,
+    'episodes': 24 * 60 * 60,
+    # Shows that weren't found and files that couldn't be parsed.
+    'title': 3 * 24 * 60 * 60,
+    'file': 3 * 24 * 60 * 60,
+}
+
+MAX_SIZE = 64 * 1024 * 1024
+
+
+#
+# Function
+#
+def defaultCacheDir():
+    if platform.system() == 'Windows':
+        baseDir = os.path.expandvars('%LOCALAPPDATA%')
+    else:
+        baseDir = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(baseDir, 'renamer')
+
+
+def _keyPath(key):
+    return key.rsplit(':', 2)[0]
+
+
+#
+# Class
+#
+class Cache():
+    def __init__(self, cacheDir=None, ttl=None, maxSize=MAX_SIZE, refresh=False):
+        self._cacheDir = cacheDir if cacheDir else defaultCacheDir()
+        self._ttl = dict(TTL, **ttl) if ttl else dict(TTL)
+        self._maxSize = maxSize
+        self._refresh = refresh
+        self._lock = threading.Lock()
+
+        try:
+            os.makedirs(self._cacheDir, exist_ok=True)
+            self._db = sqlite3.connect(
+                os.path.join(self._cacheDir, 'cache.sqlite'),
+                timeout=60,
+                check_same_thread=False
+            )
+            self._setup()
+
+        except (OSError, sqlite3.Error) as err:
+            strerror = "Can't open cache in {0} - {1}.".format(self._cacheDir, err)
+            raise error.CacheError(strerror)
+
+    @property
+    def cacheDir(self):
+        return self._cacheDir
+
+    def _setup(self):
+        version = self._db.execute('PRAGMA user_version').fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._db.execute('DROP TABLE IF EXISTS entries')
+            self._db.execute('PRAGMA user_version = {}'.format(SCHEMA_VERSION))
+
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' url TEXT PRIMARY KEY,'
+            ' kind TEXT NOT NULL,'
+            ' data TEXT NOT NULL,'
+            ' etag TEXT,'
+            ' modified TEXT,'
+            ' size INTEGER NOT NULL,'
+            ' stored REAL NOT NULL,'
+            ' accessed REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS aliases ('
+            ' identifier TEXT NOT NULL,'
+            ' year TEXT NOT NULL,'
+            ' country TEXT NOT NULL,'
+            ' show TEXT NOT NULL,'
+            ' stored REAL NOT NULL,'
+            ' PRIMARY KEY (identifier, year, country))'
+        )
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS negatives ('
+            ' key TEXT NOT NULL,'
+            ' kind TEXT NOT NULL,'
+            ' reason TEXT NOT NULL,'
+            ' stored REAL NOT NULL,'
+            ' PRIMARY KEY (kind, key))'
+        )
+        self._db.commit()
+
+    def _isFresh(self, kind, stored):
+        return time.time() - stored < self._ttl.get(kind, 0)
+
+    def _failed(self, err):
+        # A broken cache only costs extra requests, so carry on without it.
+        logger.warn("Cache in {0} failed - {1}.".format(self._cacheDir, err))
+        try:
+            self._db.rollback()
+
+        except sqlite3.Error:
+            pass
+
+    def get(self, url, kind):
+        if self._refresh:
+            return None
+
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    'SELECT data, stored FROM entries WHERE url = ? AND kind = ?', (url, kind)
+                ).fetchone()
+                if not row or not self._isFresh(kind, row[1]):
+                    return None
+
+                self._db.execute(
+                    'UPDATE entries SET accessed = ? WHERE url = ?', (time.time(), url)
+                )
+                self._db.commit()
+
+            except sqlite3.Error as err:
+                self._failed(err)
+                return None
+
+            return row[0]
+
+    def lookup(self, url, kind):
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    'SELECT data, etag, modified FROM entries WHERE url = ? AND kind = ?',
+                    (url, kind)
+                ).fetchone()
+
+            except sqlite3.Error as err:
+                self._failed(err)
+                return None
+
+        return Entry(*row) if row else None
+
+    def touch(self, url):
+        now = time.time()
+        with self._lock:
+            try:
+                self._db.execute(
+                    'UPDATE entries SET stored = ?, accessed = ? WHERE url = ?', (now, now, url)
+                )
+                self._db.commit()
+
+            except sqlite3.Error as err:
+                self._failed(err)
+
+    def put(self, url, kind, data, etag=None, modified=None):
+        now = time.time()
+        with self._lock:
+            try:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (url, kind, data, etag, modified, len(data.encode('UTF-8')), now, now)
+                )
+                self._evict()
+                self._db.commit()
+
+            except sqlite3.Error as err:
+                self._failed(err)
+
+    def getAlias(self, identifier, year=None, country=None):
+        if self._refresh:
+            return None
+
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    'SELECT show FROM aliases WHERE identifier = ? AND year = ? AND country = ?',
+                    (identifier, year or '', country or '')
+                ).fetchone()
+
+            except sqlite3.Error as err:
+                self._failed(err)
+                return None
+
+        return row[0] if row else None
+
+    def putAlias(self, identifier, year, country, show):
+        with self._lock:
+            try:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO aliases VALUES (?, ?, ?, ?, ?)',
+                    (identifier, year or '', country or '', show, time.time())
+                )
+                self._db.commit()
+
+            except sqlite3.Error as err:
+                self._failed(err)
+
+    def isNegative(self, kind, key):
+        if self._refresh:
+            return False
+
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    'SELECT stored FROM negatives WHERE kind = ? AND key = ?', (kind, key)
+                ).fetchone()
+
+            except sqlite3.Error as err:
+                self._failed(err)
+                return False
+
+        return bool(row) and self._isFresh(kind, row[0])
+
+    def putNegative(self, kind, key, reason):
+        with self._lock:
+            try:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO negatives VALUES (?, ?, ?, ?)',
+                    (key, kind, reason, time.time())
+                )
+                self._db.commit()
+
+            except sqlite3.Error as err:
+                self._failed(err)
+
+    def negatives(self, kind=None):
+        with self._lock:
+            try:
+                rows = self._db.execute(
+                    'SELECT kind, key, reason, stored FROM negatives ORDER BY kind, key'
+                ).fetchall()
+
+            except sqlite3.Error as err:
+                self._failed(err)
+                return []
+
+        return [
+            Negative(*x) for x in rows
+            if (kind is None or x[0] == kind) and self._isFresh(x[0], x[3])
+        ]
+
+    def negativeSet(self, kind):
+        keys = set() if self._refresh else set(x.key for x in self.negatives(kind))
+        return NegativeSet(self, kind, keys)
+
+    def clearNegatives(self):
+        with self._lock:
+            try:
+                count = self._db.execute('DELETE FROM negatives').rowcount
+                self._db.commit()
+
+            except sqlite3.Error as err:
+                self._failed(err)
+                return 0
+
+        return count
+
+    def _evict(self):
+        total = self._db.execute('SELECT TOTAL(size) FROM entries').fetchone()[0]
+        if total <= self._maxSize:
+            return
+
+        stale = []
+        for url, size in self._db.execute('SELECT url, size FROM entries ORDER BY accessed'):
+            if total <= self._maxSize:
+                break
+            stale.append((url,))
+            total -= size
+
+        self._db.executemany('DELETE FROM entries WHERE url = ?', stale)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class NegativeSet():
+    def __init__(self, cache, kind, keys):
+        self._cache = cache
+        self._kind = kind
+        self._keys = keys
+        # File keys are 'path:size:mtime', so paths can be checked without a stat.
+        self._paths = set(_keyPath(x) for x in keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def hasPath(self, path):
+        return path in self._paths
+
+    def add(self, key, reason):
+        self._keys.add(key)
+        self._paths.add(_keyPath(key))
+        self._cache.putNegative(self._kind, key, reason)
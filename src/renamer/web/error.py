@@ -14,3 +14,19 @@ class DownloadError(Exception):
 
 class NotFoundError(Exception):
     '''Raise when show can't be found in the remote database.'''
+
+
+class CacheError(Exception):
+    '''Raise when the metadata cache can't be opened.'''
+
+
+class CatalogError(Exception):
+    '''Raise when the offline show catalog can't be read.'''
+
+
+class AliasError(Exception):
+    '''Raise when the aliases file can't be read.'''
+
+
+class SkippedError(NotFoundError):
+    '''Raise when show wasn't found on a recent run and isn't searched again.'''
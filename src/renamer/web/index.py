@@ -0,0 +1,107 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+import re
+import json
+
+from collections import Counter, OrderedDict
+
+from . import error, match
+from .types import ShowInfo, API
+
+
+#
+# Global var
+#
+# Candidates sharing the most trigrams with the title are scored.
+SHORTLIST = 50
+# Unlike the search endpoint, the index has no relevance cut-off of its own.
+MIN_SCORE = 85
+
+reSep = re.compile(r'[\W_]+')
+
+
+#
+# Function
+#
+def _grams(name):
+    text = ' {} '.format(reSep.sub(' ', name.lower()).strip())
+    return set(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _showInfo(record):
+    href = '{0}/shows/{1}'.format(API, record['id'])
+    return ShowInfo(
+        title=record['name'],
+        country=record.get('country'),
+        premier=record['premiered'],
+        thetvdb=record.get('thetvdb'),
+        href=href,
+        link='{}/episodes'.format(href)
+    )
+
+
+def loadCatalog(path):
+    shows = []
+    try:
+        with open(path, encoding='UTF-8') as catalog:
+            for number, line in enumerate(catalog, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if record.get('premiered'):
+                        shows.append(_showInfo(record))
+
+                except (ValueError, KeyError, AttributeError):
+                    strerror = "Invalid show on line {0} of {1}.".format(number, path)
+                    raise error.CatalogError(strerror)
+
+    except OSError as err:
+        raise error.CatalogError("Can't read catalog {0} - {1}.".format(path, err.strerror))
+
+    return ShowIndex(shows)
+
+
+#
+# Class
+#
+class ShowIndex():
+    def __init__(self, shows):
+        self._shows = list(shows)
+        self._grams = {}
+        for number, show in enumerate(self._shows):
+            for gram in _grams(show.title):
+                self._grams.setdefault(gram, []).append(number)
+
+    def __len__(self):
+        return len(self._shows)
+
+    def shortlist(self, title, limit=SHORTLIST):
+        hits = Counter()
+        for gram in _grams(title):
+            hits.update(self._grams.get(gram, ()))
+        return [self._shows[x] for x, _ in hits.most_common(limit)]
+
+    def searchMany(self, titles):
+        # Each title is only scored against its own shortlist.
+        matches = OrderedDict()
+        for title in titles:
+            if title not in matches:
+                matches.update(match.bestMatches([title], self.shortlist(title), MIN_SCORE))
+        return matches
+
+    def search(self, title):
+        showsList = self.searchMany([title])[title]
+        if not showsList:
+            strerror = "Could not find {}.".format(title.upper())
+            raise error.NotFoundError(strerror)
+
+        return showsList
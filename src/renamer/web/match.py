@@ -0,0 +1,84 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+from collections import OrderedDict
+
+
+#
+# Global var
+#
+# rapidfuzz finds the optimal alignments where fuzzywuzzy settles for heuristic
+# ones, so it never scores lower by more than rounding; the slack covers that.
+SLACK = 5
+
+
+#
+# Function
+#
+def _process(choices):
+    from fuzzywuzzy import utils
+
+    return [utils.full_process(x, force_ascii=True) for x in choices]
+
+
+def _rapidScores(queries, choices, cutoff):
+    from rapidfuzz import fuzz, process
+    from fuzzywuzzy import fuzz as fuzzy
+
+    # rapidfuzz only discards choices that can't reach the cutoff; the rest are
+    # scored by fuzzywuzzy, so installing it doesn't change matches or ties.
+    processed = _process(choices)
+    matrix = []
+    for query in _process(queries):
+        row = [0] * len(choices)
+        for choice, _, column in process.extract(
+                query, processed, scorer=fuzz.WRatio, processor=None,
+                score_cutoff=max(0, cutoff - SLACK), limit=None):
+            score = fuzzy.WRatio(query, choice, full_process=False)
+            row[column] = score if score >= cutoff else 0
+        matrix.append(row)
+    return matrix
+
+
+def _fuzzyScores(queries, choices, cutoff):
+    from fuzzywuzzy import fuzz
+
+    # Process each choice once instead of once per query.
+    processed = _process(choices)
+    matrix = []
+    for query in _process(queries):
+        row = [fuzz.WRatio(query, x, full_process=False) for x in processed]
+        matrix.append([x if x >= cutoff else 0 for x in row])
+    return matrix
+
+
+def scoreMatrix(queries, choices, cutoff=0):
+    queries = list(queries)
+    choices = list(choices)
+    try:
+        return _rapidScores(queries, choices, cutoff)
+
+    except ImportError:
+        return _fuzzyScores(queries, choices, cutoff)
+
+
+def bestMatches(queries, candidates, cutoff=0):
+    queries = list(queries)
+    candidates = list(candidates)
+    matrix = scoreMatrix(queries, [x.title for x in candidates], cutoff)
+
+    matches = OrderedDict()
+    for query, row in zip(queries, matrix):
+        highScore = max(row) if row else 0
+        if not row or highScore < cutoff:
+            matches[query] = []
+        else:
+            matches[query] = [x for x, y in zip(candidates, row) if y == highScore]
+    return matches
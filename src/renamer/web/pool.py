@@ -0,0 +1,113 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+import threading
+
+from collections import namedtuple
+from urllib.parse import urlsplit, urljoin
+
+from renamer import __version__
+
+from . import error
+
+
+#
+# Global var
+#
+Response = namedtuple('Response', ['status', 'headers', 'body'])
+
+REDIRECTS = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+
+#
+# Class
+#
+class ConnectionPool():
+    def __init__(self, size=4, timeout=30):
+        self._size = max(1, size)
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self._size)
+        self._idle = {}
+
+    @property
+    def size(self):
+        return self._size
+
+    def _acquire(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+
+        import http.client
+
+        scheme, host, port = key
+        if scheme == 'https':
+            conn = http.client.HTTPSConnection(host, port, timeout=self._timeout)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self._timeout)
+        return conn, False
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._size:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _fetch(self, url, headers):
+        import http.client
+
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = '{}?{}'.format(parts.path, parts.query) if parts.query else parts.path
+        reqHeaders = {'User-Agent': 'renamer/{}'.format(__version__)}
+        reqHeaders.update(headers)
+
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request('GET', path or '/', headers=reqHeaders)
+                down = conn.getresponse()
+                body = down.read()
+
+            except (http.client.HTTPException, OSError) as err:
+                conn.close()
+                # The server may have dropped an idle keep-alive connection.
+                if reused:
+                    continue
+                raise error.DownloadError("Failed to fetch data - {0}.".format(err))
+
+            if down.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return Response(status=down.status, headers=down.msg, body=body)
+
+    def request(self, url, headers=None):
+        with self._slots:
+            for _ in range(MAX_REDIRECTS):
+                down = self._fetch(url, headers or {})
+                location = down.headers.get('Location')
+                if down.status not in REDIRECTS or not location:
+                    return down
+                url = urljoin(url, location)
+
+        raise error.DownloadError("Too many redirects for {0}.".format(url))
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle = {}
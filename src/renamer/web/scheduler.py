@@ -0,0 +1,130 @@
+# Copyright (c) 2014 - 2018, Carlos Millett
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the Simplified BSD License.  See the LICENSE file for details.
+
+
+#
+# Import
+#
+import time
+import random
+import logging
+import threading
+
+from . import error
+
+
+#
+# Global var
+#
+logger = logging.getLogger('Renamer.Web')
+
+# TVmaze allows about 20 calls every 10 seconds per IP.
+RATE = 2.0
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+#
+# Class
+#
+class TokenBucket():
+    def __init__(self, rate, burst=None):
+        self._rate = rate
+        self._capacity = burst if burst else max(1.0, rate)
+        self._tokens = self._capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._stamp) * self._rate)
+        self._stamp = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self._rate
+            time.sleep(delay)
+
+    def pause(self, delay):
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0) - delay * self._rate
+
+
+class Scheduler():
+    def __init__(self, client, rate=RATE, retries=5, backoff=1.0, maxDelay=60.0):
+        self._client = client
+        self._bucket = TokenBucket(rate) if rate else None
+        self._retries = retries
+        self._backoff = backoff
+        self._maxDelay = maxDelay
+
+    @property
+    def client(self):
+        return self._client
+
+    def _backoffDelay(self, attempt):
+        delay = min(self._maxDelay, self._backoff * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _retryAfter(self, down):
+        value = down.headers.get('Retry-After')
+        if not value:
+            return None
+
+        try:
+            delay = float(value)
+
+        except ValueError:
+            from email.utils import parsedate_to_datetime
+
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+
+        return min(self._maxDelay, max(0.0, delay))
+
+    def request(self, url, headers=None):
+        attempt = 0
+        while True:
+            if self._bucket:
+                self._bucket.acquire()
+
+            try:
+                down = self._client.request(url, headers)
+
+            except error.DownloadError as err:
+                if attempt >= self._retries:
+                    raise
+                delay = self._backoffDelay(attempt)
+                paused = False
+                reason = err
+
+            else:
+                if down.status not in RETRY_STATUS or attempt >= self._retries:
+                    return down
+                delay = self._retryAfter(down)
+                if delay is None:
+                    delay = self._backoffDelay(attempt)
+                # Throttling applies to every worker, so hold the whole bucket.
+                paused = down.status == 429 and self._bucket is not None
+                if paused:
+                    self._bucket.pause(delay)
+                reason = 'HTTP {}'.format(down.status)
+
+            logger.info('Retrying {0} in {1:.1f}s ({2}).'.format(url, delay, reason))
+            if not paused:
+                time.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        self._client.close()
@@ -9,83 +9,174 @@
 # Import
 #
 import re
+import sys
+import gzip
 import json
 import time
+import threading
 
 from collections import namedtuple
-from urllib import error as urlerr
-from urllib import request as urlRequest
 
-from fuzzywuzzy import fuzz
+from . import error, pool, scheduler, match, alias
 
-from . import error
+
+#
+# Global var
+#
+API = 'http://api.tvmaze.com'
+
+ShowInfo = namedtuple('ShowInfo', ['title', 'country', 'premier', 'thetvdb', 'href', 'link'])
+
+
+#
+# Function
+#
+def _showInfo(show):
+    provider = show['network'] if show['network'] else show['webChannel']
+    countryCode = provider['country']['code'] if provider and provider['country'] else None
+    return ShowInfo(
+        title=show['name'],
+        country=countryCode,
+        premier=show['premiered'],
+        thetvdb=show['externals']['thetvdb'],
+        href=show['_links']['self']['href'],
+        link='{}/episodes'.format(show['_links']['self']['href'])
+    )
 
 
 #
 # Class
 #
 class Web():
-    def _downloadData(self, link):
+    cache = None
+    index = None
+    aliases = None
+    offline = False
+    client = scheduler.Scheduler(pool.ConnectionPool())
+
+    def _decodeData(self, down):
+        body = down.body
         try:
-            down = urlRequest.urlopen(link)
+            if down.headers.get('Content-Encoding', '').lower() == 'gzip':
+                body = gzip.decompress(body)
+            return body.decode('UTF-8')
 
-        except urlerr.URLError:
-            raise error.DownloadError("Failed to fetch data.")
+        except (OSError, EOFError, UnicodeDecodeError):
+            raise error.DownloadError("Failed to decode data.")
 
-        else:
-            data = down.read()
-            text = json.loads(data.decode('UTF-8'))
-            return text
+    def _downloadData(self, link, kind):
+        entry = None
+        if self.cache:
+            data = self.cache.get(link, kind)
+            if data is not None:
+                return json.loads(data)
+            entry = self.cache.lookup(link, kind)
+
+        if self.offline:
+            if entry:
+                return json.loads(entry.data)
+            raise error.DownloadError("Working offline, can't fetch {0}.".format(link))
+
+        headers = {'Accept-Encoding': 'gzip'}
+        if entry and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry and entry.modified:
+            headers['If-Modified-Since'] = entry.modified
+
+        down = self.client.request(link, headers)
+        if down.status == 304 and entry:
+            self.cache.touch(link)
+            return json.loads(entry.data)
+
+        if down.status != 200:
+            strerror = "Failed to fetch data - HTTP {0}.".format(down.status)
+            raise error.DownloadError(strerror)
+
+        data = self._decodeData(down)
+        text = json.loads(data)
+        if self.cache:
+            etag = down.headers.get('ETag')
+            modified = down.headers.get('Last-Modified')
+            self.cache.put(link, kind, data, etag, modified)
+        return text
 
     def searchShow(self, title):
         saneTitle = re.sub(r'\W', '+', title)
         url = [self.url]
         url.extend(['search', 'q={}'.format(saneTitle)])
         link = '&'.join(url)
-        return self._downloadData(link)
+        return self._downloadData(link, 'search')
+
+    def lookupShowId(self, showId):
+        link = '{0}/shows/{1}'.format(API, showId)
+        return self._downloadData(link, 'show')
 
     def lookupShow(self):
         link = self._show.link
-        return self._downloadData(link)
+        return self._downloadData(link, 'episodes')
+
+    def lookupSeasons(self):
+        link = '{}/seasons'.format(self._show.href)
+        return self._downloadData(link, 'seasons')
+
+    def lookupSeason(self, href):
+        link = '{}/episodes'.format(href)
+        return self._downloadData(link, 'episodes')
 
 
 class TvShow(Web):
-    def __init__(self, title, country=None, year=None):
-        self.url = 'http://api.tvmaze.com/search/shows?'
+    def __init__(self, title, country=None, year=None, candidates=None):
+        self.url = '{}/search/shows?'.format(API)
         self._show = None
-        self._season = None
-        self._curSeason = None
-        self._show = self._selectShow(self._findShow(title), country, year)
+        self._episodes = {}
+        self._lock = threading.Lock()
+        self._seasonLinks = None
+        self._loadedSeasons = set()
+        self._fullList = False
+        self._show = self._aliasShow(title, country, year)
+        if self._show is None:
+            if candidates is None:
+                candidates = self._candidates(title)
+            self._show = self._selectShow(list(candidates), country, year)
+            if self.cache:
+                key = alias.aliasKey(title, country, year)
+                self.cache.putAlias(*key, show=json.dumps(self._show))
 
-    def _findShow(self, title):
-        showCandidate = namedtuple('ShowInfo', ['title', 'country', 'premier', 'thetvdb', 'link'])
-        showItem = namedtuple('ShowItem', ['score', 'show'])
-        showsList = []
+    def _candidates(self, title):
+        key = alias.aliasKey(title)[0]
+        if self.cache and self.cache.isNegative('title', key):
+            strerror = "{} wasn't found recently, skipping.".format(title.upper())
+            raise error.SkippedError(strerror)
 
-        showInfo = self.searchShow(title)
-        for entry in [x for x in showInfo if x['show']['premiered']]:
-            network = entry['show']['network']
-            webchannel = entry['show']['webChannel']
-            showProvider = network if network else webchannel
-            countryCode = showProvider['country']['code'] if showProvider['country'] else None
-
-            item = showCandidate(
-                title=entry['show']['name'],
-                country=countryCode,
-                premier=entry['show']['premiered'],
-                thetvdb=entry['show']['externals']['thetvdb'],
-                link='{}/episodes'.format(entry['show']['_links']['self']['href'])
-            )
+        try:
+            return self.index.search(title) if self.index else self._findShow(title)
 
-            score = fuzz.WRatio(title, item.title)
-            showsList.append(showItem(score=score, show=item))
+        except error.NotFoundError as err:
+            if self.cache:
+                self.cache.putNegative('title', key, str(err))
+            raise
 
+    def _aliasShow(self, title, country, year):
+        showId = alias.findAlias(self.aliases, title, country, year) if self.aliases else None
+        if showId is not None:
+            return _showInfo(self.lookupShowId(showId))
+
+        if self.cache:
+            show = self.cache.getAlias(*alias.aliasKey(title, country, year))
+            if show:
+                return ShowInfo(*json.loads(show))
+        return None
+
+    def _findShow(self, title):
+        showInfo = self.searchShow(title)
+        candidates = [_showInfo(x['show']) for x in showInfo if x['show']['premiered']]
+
+        showsList = match.bestMatches([title], candidates)[title]
         if not showsList:
             strerror = "Could not find {}.".format(title.upper())
             raise error.NotFoundError(strerror)
 
-        highScore = max([x.score for x in showsList])
-        return [x.show for x in showsList if x.score == highScore]
+        return showsList
 
     def _selectShow(self, showsList, country, year):
         showsList.sort(key=lambda x: x.premier)
@@ -107,33 +198,69 @@ class TvShow(Web):
             sel = [x for x in showsList if country == x.country]
 
         else:
-            sel = [x for x in showsList if x.thetvdb]
+            # Catalog shows may lack the id, so it only breaks ties.
+            sel = [x for x in showsList if x.thetvdb] or showsList
+
+        if not sel:
+            strerror = "Could not find {0} from {1}.".format(
+                showsList[0].title.upper(), ' '.join(x for x in [country, year] if x)
+            )
+            raise error.NotFoundError(strerror)
 
         return sel[0]
 
-    def populate(self):
-        self._epsInfo = self.lookupShow()
+    def populate(self, seasons=None):
+        with self._lock:
+            if seasons is None:
+                self._loadFullList()
+            else:
+                for season in sorted(seasons):
+                    self._loadSeason(season)
+
+    def _index(self, epsInfo):
+        for x in [x for x in epsInfo if x['number'] is not None]:
+            season = sys.intern('{:0>2}'.format(x['season']))
+            episode = sys.intern('{:0>2}'.format(x['number']))
+            self._episodes.setdefault(season, {})[episode] = x['name']
+
+    def _loadFullList(self):
+        self._index(self.lookupShow())
+        self._fullList = True
+
+    def _loadSeason(self, season):
+        if self._fullList or season in self._loadedSeasons:
+            return
+
+        if self._seasonLinks is None:
+            self._seasonLinks = {
+                '{:0>2}'.format(x['number']): x['_links']['self']['href']
+                for x in self.lookupSeasons() if x['number'] is not None
+            }
+
+        href = self._seasonLinks.get(season)
+        if not href:
+            self._loadFullList()
+            return
+
+        self._index(self.lookupSeason(href))
+        self._loadedSeasons.add(season)
+
+    def episodeTitle(self, season, episode):
+        try:
+            return self._episodes[season][episode]
+
+        except KeyError:
+            with self._lock:
+                self._loadSeason(season)
+            return self._episodes[season][episode]
 
     @property
     def title(self):
         return self._show.title
 
     @property
-    def season(self):
-        return self._curSeason
-
-    @season.setter
-    def season(self, season):
-        if self._curSeason != season:
-            self._curSeason = season
-            self._season = {
-                '{:0>2}'.format(x['number']): x['name']
-                for x in self._epsInfo if '{:0>2}'.format(x['season']) == self._curSeason
-            }
-
-    @property
-    def seasonEps(self):
-        return self._season
+    def year(self):
+        return self._show.premier[:4]
 
     @property
     def thetvdb(self):
@@ -10,7 +10,9 @@
 #
 import logging
 
-from . import types, error
+from concurrent.futures import ThreadPoolExecutor
+
+from . import types, error, cache, pool, scheduler, index, alias
 
 
 #
@@ -18,20 +20,84 @@ from . import types, error
 #
 logger = logging.getLogger('Renamer.Web')
 
+# Above this many seasons a single request for the whole list is cheaper.
+SEASONS_LIMIT = 3
+
 
 #
 # Function
 #
-def genShowsDict(showFiles):
+def setupCache(cacheDir=None, refresh=False):
+    try:
+        types.Web.cache = cache.Cache(cacheDir, refresh=refresh)
+
+    except error.CacheError as err:
+        logger.warn(err)
+
+    else:
+        logger.info('Using cache in {0}.'.format(types.Web.cache.cacheDir))
+
+
+def failedFiles():
+    if not types.Web.cache:
+        return None
+    return types.Web.cache.negativeSet('file')
+
+
+def setupClient(poolSize=4, rate=scheduler.RATE, offline=False):
+    types.Web.client = scheduler.Scheduler(pool.ConnectionPool(poolSize), rate)
+    types.Web.offline = offline
+
+
+def setupAliases(path):
+    types.Web.aliases = alias.loadAliases(path)
+    logger.info('Loaded {0} alias(es) from {1}.'.format(len(types.Web.aliases), path))
+
+
+def setupIndex(catalog):
+    types.Web.index = index.loadCatalog(catalog)
+    logger.info('Loaded {0} show(s) from {1}.'.format(len(types.Web.index), catalog))
+
+
+def _newShow(title, country, year, candidates=None):
+    logger.info('Downloading information for {0}.'.format(title.upper()))
+    return types.TvShow(title, country, year, candidates)
+
+
+def _populateShow(show, seasons):
+    logger.info('Downloading episodes list for {0}.'.format(show.title))
+    show.populate(seasons)
+
+
+def genShowsDict(showFiles, jobs=1):
     showInfo = {}
-    for show in set((x.title, x.country, x.year, x.identifier) for x in showFiles):
-        try:
-            logger.info('Downloading information for {0}.'.format(show[0].upper()))
-            showInfo[show[3]] = types.TvShow(show[0], show[1], show[2])
+    shows = {}
+    for x in showFiles:
+        shows.setdefault(x.identifier, (x.title, x.country, x.year))
+
+    # Match every title against the offline index in one batch.
+    matches = {}
+    if types.Web.index:
+        matches = types.Web.index.searchMany([x[0] for x in shows.values()])
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        jobsList = []
+        for key, show in shows.items():
+            if types.Web.index and not matches[show[0]]:
+                logger.warn("Could not find {}.".format(show[0].upper()))
+                continue
+            candidates = matches.get(show[0])
+            jobsList.append((key, executor.submit(_newShow, *show, candidates=candidates)))
 
-        except (error.DownloadError, error.NotFoundError) as err:
-            logger.warn(err)
-            showFiles = [x for x in showFiles if x.title != show[0]]
+        for key, job in jobsList:
+            try:
+                showInfo[key] = job.result()
+
+            except error.SkippedError as err:
+                logger.info(err)
+
+            except (error.DownloadError, error.NotFoundError) as err:
+                logger.warn(err)
 
     if not showInfo:
         raise error.NotFoundError("Could not download episode's names for any show")
@@ -39,7 +105,30 @@ def genShowsDict(showFiles):
     return showInfo
 
 
-def populateShows(showInfo):
-    for show in showInfo.values():
-        logger.info('Downloading episodes list for {0}.'.format(show.title))
-        show.populate()
+def genSeasonsDict(showFiles):
+    seasons = {}
+    for ep in showFiles:
+        seasons.setdefault(ep.identifier, set()).add(ep.season)
+    return seasons
+
+
+def populateShows(showInfo, jobs=1, seasons=None):
+    seasons = seasons if seasons else {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        jobsList = []
+        for identifier, show in showInfo.items():
+            showSeasons = seasons.get(identifier)
+            if showSeasons and len(showSeasons) > SEASONS_LIMIT:
+                showSeasons = None
+            jobsList.append((identifier, executor.submit(_populateShow, show, showSeasons)))
+
+        for identifier, job in jobsList:
+            try:
+                job.result()
+
+            except error.DownloadError as err:
+                logger.warn("Can't get the episodes list for {0} - {1}".format(
+                    showInfo[identifier].title, err
+                ))
+                # Without episodes, the plan rejects the show's files.
+                del showInfo[identifier]
@@ -0,0 +1,72 @@
+import pytest
+
+from renamer.web import types
+
+
+API = 'http://api.tvmaze.com'
+
+
+def _show(showId, name, premiered, country, thetvdb):
+    return {
+        'id': showId,
+        'name': name,
+        'premiered': premiered,
+        'network': {'country': {'code': country}},
+        'webChannel': None,
+        'externals': {'thetvdb': thetvdb},
+        '_links': {'self': {'href': '{}/shows/{}'.format(API, showId)}},
+    }
+
+
+def _episodes(seasons, count):
+    return [
+        {'season': s, 'number': e, 'name': 'Episode {}x{}'.format(s, e)}
+        for s in range(1, seasons + 1) for e in range(1, count + 1)
+    ]
+
+
+class FakeTvMaze():
+    def __init__(self):
+        self.links = []
+        self.shows = {
+            'Some Show': [_show(1, 'Some Show', '2010-01-01', 'US', 100)],
+            'Other Show': [
+                _show(2, 'Other Show', '2012-05-01', 'GB', 200),
+                _show(3, 'Other Show', '2016-05-01', 'US', 300),
+            ],
+        }
+        self.episodes = {1: _episodes(4, 10), 2: _episodes(2, 6), 3: _episodes(1, 8)}
+
+    def download(self, link, kind):
+        self.links.append(link)
+        if kind == 'search':
+            query = link.split('q=')[-1].replace('+', ' ')
+            return [{'score': 1, 'show': x} for x in self.shows.get(query, [])]
+
+        path = link[len(API):].strip('/').split('/')
+        if path[0] == 'shows' and len(path) == 2:
+            shows = [y for x in self.shows.values() for y in x]
+            return [x for x in shows if x['id'] == int(path[1])][0]
+
+        if path[0] == 'shows' and path[2] == 'seasons':
+            numbers = sorted(set(x['season'] for x in self.episodes[int(path[1])]))
+            return [
+                {'id': int(path[1]) * 100 + x, 'number': x,
+                 '_links': {'self': {'href': '{}/seasons/{}'.format(API, int(path[1]) * 100 + x)}}}
+                for x in numbers
+            ]
+
+        if path[0] == 'shows':
+            return self.episodes[int(path[1])]
+
+        showId, season = divmod(int(path[1]), 100)
+        return [x for x in self.episodes[showId] if x['season'] == season]
+
+
+@pytest.fixture
+def tvmaze(monkeypatch):
+    fake = FakeTvMaze()
+    monkeypatch.setattr(
+        types.Web, '_downloadData', lambda self, link, kind: fake.download(link, kind)
+    )
+    return fake
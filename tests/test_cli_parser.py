@@ -28,3 +28,42 @@ def test_cli_parser_positional():
     parser = cli.setParser()
     args = parser.parse_args(test)
     assert args.path == test
+
+
+def test_cli_parser_cache():
+    parser = cli.setParser()
+    args = parser.parse_args(['--cache-dir', 'dir', '--refresh', 'test'])
+    assert args.cache_dir == 'dir'
+    assert args.refresh is True
+    assert args.no_cache is False
+
+
+def test_cli_parser_filters():
+    parser = cli.setParser()
+    args = parser.parse_args(
+        ['-e', 'mkv', '-e', 'mp4', '-x', '*sample*', '--min-size', '2K', 'test']
+    )
+    assert args.ext == ['mkv', 'mp4']
+    assert args.exclude == ['*sample*']
+    assert args.min_size == 2048
+
+
+def test_cli_parser_wrong_size():
+    parser = cli.setParser()
+    with pytest.raises(SystemExit):
+        parser.parse_args(['--min-size', 'big', 'test'])
+
+
+def test_cli_parser_journal():
+    parser = cli.setParser()
+    assert parser.parse_args(['--resume']).resume == ''
+    assert parser.parse_args(['--undo', 'file.journal']).undo == 'file.journal'
+    with pytest.raises(SystemExit):
+        parser.parse_args(['--undo', 'file.journal', 'test'])
+
+
+def test_cli_parser_plan():
+    parser = cli.setParser()
+    args = parser.parse_args(['--plan', 'plan.jsonl', 'test'])
+    assert args.plan == 'plan.jsonl'
+    assert parser.parse_args(['--apply', 'a.jsonl', 'b.jsonl']).apply == ['a.jsonl', 'b.jsonl']
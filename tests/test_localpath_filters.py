@@ -0,0 +1,50 @@
+import os
+
+from renamer.localpath import filters, utils
+
+
+def test_filter_extensions():
+    test = filters.FileFilter(extensions=['mkv,.MP4', 'avi'])
+    assert test.acceptFile('/some/Show.S01E01.mkv')
+    assert test.acceptFile('/some/Show.S01E01.mp4')
+    assert not test.acceptFile('/some/Show.S01E01.nfo')
+    assert not test.acceptFile('/some/Show.S01E01')
+
+
+def test_filter_exclude():
+    test = filters.FileFilter(exclude=['*sample*', '*.part', '/some/extras'])
+    assert test.acceptFile('/some/Show.S01E01.mkv')
+    assert not test.acceptFile('/some/Show.S01E01.sample.mkv')
+    assert not test.acceptFile('/some/Show.S01E01.mkv.part')
+    assert not test.acceptDir('/some/extras')
+    assert test.acceptDir('/some/other')
+
+
+def test_filter_exclude_root(tmpdir):
+    root = tmpdir.mkdir('samples').mkdir('tv')
+    root.join('Some.Show.S01E01.mkv').write('')
+    root.join('Some.Show.S01E02.sample.mkv').write('')
+    test = filters.FileFilter(exclude=['*sample*'])
+    found = utils.traversePath([str(root)], True, test)
+    assert [os.path.basename(x) for x in found] == ['Some.Show.S01E01.mkv']
+    assert not filters.FileFilter(exclude=['*/samples/*']).acceptFile(found[0])
+
+
+def test_filter_min_size(tmpdir):
+    small = tmpdir.join('small.mkv')
+    small.write('x')
+    big = tmpdir.join('big.mkv')
+    big.write('x' * 100)
+    test = filters.FileFilter(minSize=50)
+    assert not test.acceptFile(str(small))
+    assert test.acceptFile(str(big))
+
+
+def test_filter_prune_dirs(tmpdir):
+    tmpdir.join('Some.Show.S01E01.mkv').write('')
+    tmpdir.join('Some.Show.S01E01.nfo').write('')
+    tmpdir.mkdir('Sample').join('Some.Show.S01E01.mkv').write('')
+    test = filters.FileFilter(extensions=['mkv'], exclude=['Sample'])
+    found = utils.traversePath([str(tmpdir)], True, test)
+    assert [os.path.basename(x) for x in found] == ['Some.Show.S01E01.mkv']
+    assert all('Sample' not in x for x in found)
@@ -0,0 +1,137 @@
+import os
+
+import pytest
+
+from renamer.localpath import journal, types, utils, error
+
+
+def _file(path, name, newName):
+    path.join(name).write('')
+    test = types.SerieFile(str(path.join(name)))
+    test.newFileName = newName
+    return test
+
+
+@pytest.fixture
+def files(tmpdir):
+    media = tmpdir.mkdir('media')
+    return [
+        _file(media, 'Some.Show.S01E01.ext', 'Some Show - 01x01 - Pilot'),
+        _file(media, 'Some.Show.S01E02.ext', 'Some Show - 01x02 - Second'),
+    ]
+
+
+def test_journal_resume(tmpdir, files):
+    test = journal.Journal(str(tmpdir.join('journal')))
+    test.record(files)
+    files[0].rename()
+
+    assert journal.latest(str(tmpdir.join('journal'))) == test.path
+    assert journal.resume(test.path) == 2
+    assert sorted(os.listdir(str(tmpdir.join('media')))) == [
+        'Some Show - 01x01 - Pilot.ext',
+        'Some Show - 01x02 - Second.ext',
+    ]
+    with pytest.raises(error.JournalError):
+        journal.latest(str(tmpdir.join('journal')))
+
+
+def test_journal_undo(tmpdir, files):
+    test = journal.Journal(str(tmpdir.join('journal')))
+    test.record(files)
+    for ep in files:
+        ep.rename()
+    test.close()
+
+    assert journal.undo(test.path) == 2
+    assert sorted(os.listdir(str(tmpdir.join('media')))) == [
+        'Some.Show.S01E01.ext',
+        'Some.Show.S01E02.ext',
+    ]
+    with pytest.raises(error.JournalError):
+        journal.undo(test.path)
+
+
+def test_journal_same_name(tmpdir, caplog):
+    media = tmpdir.mkdir('media')
+    media.join('same.mkv').write('')
+    media.join('A').write('a')
+    test = journal.Journal(str(tmpdir.join('journal')))
+    test.record(_steps(media, ('same.mkv', 'same.mkv'), ('A', 'B')))
+
+    assert journal.resume(test.path) == 1
+    assert sorted(os.listdir(str(media))) == ['B', 'same.mkv']
+    assert not [x for x in caplog.records if 'same.mkv' in x.getMessage()]
+
+
+def test_journal_torn_line(tmpdir, files):
+    test = journal.Journal(str(tmpdir.join('journal')))
+    test.record(files)
+    with open(test.path, 'a') as journalFile:
+        journalFile.write('{"dir": "/so')
+
+    assert journal.resume(test.path) == 2
+
+
+def test_journal_missing():
+    with pytest.raises(error.JournalError):
+        journal.resume('/does/not/exist.journal')
+
+
+def _steps(media, *renames):
+    return [types.RenameStep(str(media.join(x)), y) for x, y in renames]
+
+
+def _contents(media):
+    return {x.basename: x.read() for x in media.listdir()}
+
+
+def test_journal_resume_chain(tmpdir):
+    media = tmpdir.mkdir('media')
+    media.join('A').write('a')
+    media.join('B').write('b')
+    steps = _steps(media, ('B', 'C'), ('A', 'B'))
+    test = journal.Journal(str(tmpdir.join('journal')))
+    test.record(steps)
+    # Crash after both renames, with the last one not yet recorded.
+    utils.renameFiles(steps, journal=test)
+
+    assert journal.resume(test.path) == 2
+    assert _contents(media) == {'B': 'a', 'C': 'b'}
+
+
+def test_journal_resume_cycle(tmpdir):
+    media = tmpdir.mkdir('media')
+    media.join('A').write('a')
+    media.join('B').write('b')
+    steps = _steps(media, ('A', 'T'), ('B', 'A'), ('T', 'B'))
+    test = journal.Journal(str(tmpdir.join('journal')))
+    test.record(steps)
+    utils.renameFiles(steps, journal=test)
+
+    assert journal.resume(test.path) == 3
+    assert _contents(media) == {'A': 'b', 'B': 'a'}
+
+
+def test_journal_resume_cycle_partial(tmpdir):
+    media = tmpdir.mkdir('media')
+    media.join('A').write('a')
+    media.join('B').write('b')
+    steps = _steps(media, ('A', 'T'), ('B', 'A'), ('T', 'B'))
+    test = journal.Journal(str(tmpdir.join('journal')))
+    test.record(steps)
+    utils.renameFiles(steps[:2], journal=test)
+
+    assert journal.resume(test.path) == 3
+    assert _contents(media) == {'A': 'b', 'B': 'a'}
+
+
+def test_journal_resume_target_exists(tmpdir):
+    media = tmpdir.mkdir('media')
+    media.join('A').write('a')
+    media.join('B').write('b')
+    test = journal.Journal(str(tmpdir.join('journal')))
+    test.record(_steps(media, ('A', 'B')))
+
+    assert journal.resume(test.path) == 0
+    assert _contents(media) == {'A': 'a', 'B': 'b'}
@@ -0,0 +1,60 @@
+import pytest
+
+from renamer.localpath import parser, types, error
+
+
+def test_parser_scene_lowercase():
+    test = parser.parse('some.show.s02e03.foo.ext')
+    assert test == parser.ShowInfo('Some Show', None, None, '02', ['03'])
+
+
+def test_parser_layout_priority():
+    test = parser.parse('Some.Show.125.Other - 03x04 - Foo.S01E02.ext')
+    assert test.season == '01'
+    assert test.episodes == ['02']
+
+
+def test_parser_country_uk():
+    test = parser.parse('Some.Show.UK.S01E02.ext')
+    assert test.title == 'Some Show'
+    assert test.country == 'GB'
+
+
+def test_parser_not_country():
+    assert parser.formatName('Some.Show.ZZ.') == {
+        'title': 'Some Show Zz',
+        'country': None,
+        'year': None
+    }
+
+
+def test_parser_identifier():
+    assert parser.identifier("Marvel's Cloak & Dagger") == 'MARVELSCLOAKDAGGER'
+
+
+def test_parser_error():
+    with pytest.raises(error.MatchNotFoundError):
+        parser.parse('Some.Show.ext')
+
+
+def test_serie_file_compact():
+    first = types.SerieFile('/some/dir/Some.Show.S01E01.ext')
+    info = ('Some Show', None, None, '01', ['02'])
+    second = types.SerieFile('/some/dir/Some.Show.S01E02.ext', info)
+    assert not hasattr(first, '__dict__')
+    assert not hasattr(types.RenameStep('a', 'b'), '__dict__')
+    assert first.title is second.title
+    assert first.season is second.season
+    assert first.identifier is second.identifier
+    assert first.dirName is second.dirName
+    assert second.fileNameExt == '.ext'
+
+
+def test_parser_normalize_cached():
+    parser.clearCache()
+    first = parser.parse('The.Show.2017.S01E01.ext')
+    second = parser.parse('The.Show.2017.S01E02.ext')
+    assert parser.cacheInfo().hits == 1
+    assert parser.cacheInfo().misses == 1
+    assert first.title is second.title
+    assert parser.normalize('The.Show.2017') == ('The Show', None, '2017', 'THESHOW')
@@ -0,0 +1,54 @@
+import os
+
+from renamer.localpath import utils, types, error
+
+
+def _file(path, name, newName):
+    path.join(name).write('')
+    test = types.SerieFile(str(path.join(name)))
+    test.newFileName = newName
+    return test
+
+
+def test_rename_files(tmpdir):
+    other = tmpdir.mkdir('other')
+    files = [
+        _file(tmpdir, 'Some.Show.S01E01.ext', 'Some Show - 01x01 - Pilot'),
+        _file(other, 'Some.Show.S01E02.ext', 'Some Show - 01x02 - Second'),
+        _file(tmpdir, 'Some.Show.S01E03.ext', 'Some Show - 01x03 - Third'),
+    ]
+    results = utils.renameFiles(files, jobs=2)
+    assert [x.error for x in results] == [None, None, None]
+    assert sorted(os.listdir(str(tmpdir))) == [
+        'Some Show - 01x01 - Pilot.ext',
+        'Some Show - 01x03 - Third.ext',
+        'other',
+    ]
+    assert os.listdir(str(other)) == ['Some Show - 01x02 - Second.ext']
+
+
+def test_rename_files_same_file(tmpdir):
+    files = [_file(tmpdir, 'Some.Show.S01E01.ext', 'Some.Show.S01E01')]
+    results = utils.renameFiles(files)
+    assert isinstance(results[0].error, error.SameFileError)
+    assert results[0].file is files[0]
+
+
+def test_rename_files_os_error(tmpdir):
+    files = [
+        _file(tmpdir, 'Some.Show.S01E01.ext', 'x' * 300),
+        _file(tmpdir, 'Some.Show.S01E02.ext', 'Some Show - 01x02 - Second'),
+    ]
+    results = utils.renameFiles(files)
+    assert isinstance(results[0].error, OSError)
+    assert results[1].error is None
+    assert sorted(os.listdir(str(tmpdir))) == [
+        'Some Show - 01x02 - Second.ext',
+        'Some.Show.S01E01.ext',
+    ]
+
+
+def test_rename_without_dir_fd(tmpdir):
+    test = _file(tmpdir, 'Some.Show.S01E01.ext', 'Some Show - 01x01 - Pilot')
+    test.rename()
+    assert os.listdir(str(tmpdir)) == ['Some Show - 01x01 - Pilot.ext']
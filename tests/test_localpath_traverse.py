@@ -0,0 +1,119 @@
+import os
+
+import pytest
+
+from renamer.localpath import utils, error
+
+
+@pytest.fixture
+def tree(tmpdir):
+    tmpdir.join('Some.Show.S01E01.ext').write('')
+    tmpdir.join('notes.txt').write('')
+    sub = tmpdir.mkdir('Season 2')
+    sub.join('Some.Show.S02E01.ext').write('')
+    sub.mkdir('deeper').join('Some.Show.S02E02.ext').write('')
+    return tmpdir
+
+
+def test_traverse_flat(tree):
+    test = utils.traversePath([str(tree)], False)
+    assert sorted(os.path.basename(x) for x in test) == ['Some.Show.S01E01.ext', 'notes.txt']
+
+
+def test_traverse_recursive(tree):
+    test = utils.traversePath([str(tree)], True)
+    assert sorted(os.path.basename(x) for x in test) == [
+        'Some.Show.S01E01.ext',
+        'Some.Show.S02E01.ext',
+        'Some.Show.S02E02.ext',
+        'notes.txt',
+    ]
+
+
+def test_traverse_single_file(tree):
+    name = str(tree.join('notes.txt'))
+    assert utils.traversePath([name, '/does/not/exist'], False) == [name]
+
+
+def test_traverse_overlapping(tree):
+    name = str(tree.join('Season 2', 'Some.Show.S02E01.ext'))
+    test = utils.traversePath([name, str(tree), str(tree.join('Season 2'))], True)
+    assert len(test) == len(set(test)) == 4
+    assert test[0] == name
+
+
+def test_traverse_not_found():
+    with pytest.raises(FileNotFoundError):
+        utils.traversePath(['/does/not/exist'], True)
+
+
+def test_files_list(tree):
+    test = utils.genFilesList([str(tree)], True)
+    assert sorted(x.curFileName for x in test) == [
+        'Some.Show.S01E01.ext',
+        'Some.Show.S02E01.ext',
+        'Some.Show.S02E02.ext',
+    ]
+
+
+def test_files_list_no_match(tree):
+    with pytest.raises(error.MatchNotFoundError):
+        utils.genFilesList([str(tree.join('notes.txt'))])
+
+
+def test_files_list_parse_workers(tree, monkeypatch):
+    monkeypatch.setattr(utils, 'CHUNK_SIZE', 1)
+    serial = utils.genFilesList([str(tree)], True)
+    test = utils.genFilesList([str(tree)], True, workers=2)
+    assert [x.curFileName for x in test] == [x.curFileName for x in serial]
+    assert [x.season for x in test] == ['01', '02', '02']
+    assert test[0].title == serial[0].title
+
+
+def test_parse_chunk():
+    test = utils._parseChunk(['Some.Show.S01E02.ext', 'notes.txt'])
+    assert test == [('Some Show', None, None, '01', ['02']), None]
+
+
+class Failures():
+    def __init__(self):
+        self.keys = {}
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def hasPath(self, path):
+        return any(x.startswith(path + ':') for x in self.keys)
+
+    def add(self, key, reason):
+        self.keys[key] = reason
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_files_list_failures(tree, workers, monkeypatch):
+    fileKey = utils.fileKey
+    failures = Failures()
+    junk = tree.join('Season 2', 'junk.ext')
+    junk.write('')
+    test = utils.genFilesList([str(tree)], True, workers=workers, failures=failures)
+    assert len(test) == 3
+    assert sorted(failures.keys) == sorted([
+        utils.fileKey(str(junk)),
+        utils.fileKey(str(tree.join('notes.txt'))),
+    ])
+
+    # Known failures are skipped without being parsed or recorded again, and
+    # only their paths are stat'ed.
+    statted = []
+    monkeypatch.setattr(utils, 'fileKey', lambda x: statted.append(x) or fileKey(x))
+    failures.add = None
+    test = utils.genFilesList([str(tree)], True, workers=workers, failures=failures)
+    assert len(test) == 3
+    assert sorted(statted) == sorted([str(junk), str(tree.join('notes.txt'))])
+    monkeypatch.undo()
+
+    junk.write('changed')
+    assert utils.fileKey(str(junk)) not in failures
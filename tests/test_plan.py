@@ -0,0 +1,208 @@
+import pytest
+
+from renamer import plan
+from renamer.web import types
+from renamer.localpath import types as localtypes, utils as localutils, error as localerror
+
+
+def _files(*names):
+    return [localtypes.SerieFile('/some/path/{}'.format(x)) for x in names]
+
+
+def test_plan_group_by_show():
+    files = _files('Some.Show.S01E01.ext', 'Other.Show.S01E01.ext', 'Some.Show.S01E02.ext')
+    groups = plan.groupByShow(files)
+    assert list(groups) == ['SOMESHOW', 'OTHERSHOW']
+    assert [x.curFileName for x in groups['SOMESHOW']] == [
+        'Some.Show.S01E01.ext',
+        'Some.Show.S01E02.ext',
+    ]
+
+
+def test_plan_build(tvmaze):
+    files = _files(
+        'Some.Show.S01E01.ext',
+        'Some.Show.S02E03-E04.ext',
+        'Some.Show.S01E99.ext',
+        'Missing.Show.S01E01.ext',
+    )
+    show = types.TvShow('Some Show')
+    show.populate()
+    test = plan.buildPlan(plan.groupByShow(files), {'SOMESHOW': show})
+
+    assert [x.newFileName for x in test.resolved] == [
+        'Some Show - 01x01 - Episode 1x1.ext',
+        'Some Show - 02x03-04 - Episode 2x3-Episode 2x4.ext',
+    ]
+    assert [(x.file.curFileName, x.reason) for x in test.unresolved] == [
+        ('Some.Show.S01E99.ext', 'Episode not found.'),
+        ('Missing.Show.S01E01.ext', 'Show not found.'),
+    ]
+
+
+def test_plan_build_short(tvmaze):
+    show = types.TvShow('Some Show')
+    show.populate()
+    files = _files('Some.Show.S01E01.ext')
+    test = plan.buildPlan(plan.groupByShow(files), {'SOMESHOW': show}, short=True)
+    assert test.resolved[0].newFileName == '01x01 - Episode 1x1.ext'
+
+
+def _named(path, name, newName):
+    path.join(name).write(name)
+    ep = localtypes.SerieFile(str(path.join(name)))
+    ep.newFileName = newName
+    return ep
+
+
+def _contents(path):
+    return {x.basename: x.read() for x in path.listdir()}
+
+
+def test_plan_schedule_collision(tmpdir):
+    tmpdir.join('Some Show - 01x03 - Third.ext').write('')
+    files = [
+        _named(tmpdir, 'Some.Show.S01E01.ext', 'Some Show - 01x01 - Pilot'),
+        _named(tmpdir, 'Some.Show.S01E01.v2.ext', 'Some Show - 01x01 - Pilot'),
+        _named(tmpdir, 'Some.Show.S01E02.ext', 'Some Show - 01x02 - Second'),
+        _named(tmpdir, 'Some.Show.S01E03.ext', 'Some Show - 01x03 - Third'),
+    ]
+    test = plan.types.Plan()
+    plan.scheduleRenames(test, files)
+    assert [x.file.curFileName for x in test.unresolved] == [
+        'Some.Show.S01E01.ext',
+        'Some.Show.S01E01.v2.ext',
+        'Some.Show.S01E03.ext',
+    ]
+    assert [x.curFileName for x in test.resolved] == ['Some.Show.S01E02.ext']
+    assert [x.curFileName for x in test.steps] == ['Some.Show.S01E02.ext']
+
+
+def test_plan_schedule_duplicate(tmpdir):
+    files = [
+        _named(tmpdir, 'Some.Show.S01E01.ext', 'Some Show - 01x01 - Pilot'),
+        _named(tmpdir, 'Some.Show.S01E01.ext', 'Some Show - 01x01 - Pilot'),
+    ]
+    test = plan.types.Plan()
+    plan.scheduleRenames(test, files)
+    assert len(test.unresolved) == 2
+    assert test.steps == []
+
+
+def test_plan_schedule_blocked_chain(tmpdir):
+    files = [
+        _named(tmpdir, 'Some.Show.S01E01.ext', 'Some.Show.S01E02'),
+        _named(tmpdir, 'Some.Show.S01E02.ext', 'Some.Show.S01E02.v2'),
+        _named(tmpdir, 'Some.Show.S01E03.ext', 'Some.Show.S01E02.v2'),
+    ]
+    test = plan.types.Plan()
+    plan.scheduleRenames(test, files)
+    assert test.resolved == []
+    assert test.steps == []
+
+
+def test_plan_schedule_chain(tmpdir):
+    files = [
+        _named(tmpdir, 'Some.Show.S01E01.ext', 'Some.Show.S01E02'),
+        _named(tmpdir, 'Some.Show.S01E02.ext', 'Some.Show.S01E03'),
+        _named(tmpdir, 'Some.Show.S01E03.ext', 'Some.Show.S01E04'),
+    ]
+    test = plan.types.Plan()
+    plan.scheduleRenames(test, files)
+    assert [x.curFileName for x in test.steps] == [
+        'Some.Show.S01E03.ext',
+        'Some.Show.S01E02.ext',
+        'Some.Show.S01E01.ext',
+    ]
+
+    localutils.renameFiles(test.steps)
+    assert _contents(tmpdir) == {
+        'Some.Show.S01E02.ext': 'Some.Show.S01E01.ext',
+        'Some.Show.S01E03.ext': 'Some.Show.S01E02.ext',
+        'Some.Show.S01E04.ext': 'Some.Show.S01E03.ext',
+    }
+
+
+def test_plan_schedule_cycle(tmpdir):
+    files = [
+        _named(tmpdir, 'Some.Show.S01E01.ext', 'Some.Show.S01E02'),
+        _named(tmpdir, 'Some.Show.S01E02.ext', 'Some.Show.S01E03'),
+        _named(tmpdir, 'Some.Show.S01E03.ext', 'Some.Show.S01E01'),
+        _named(tmpdir, 'Other.Show.S01E01.ext', 'Other.Show.S01E01'),
+    ]
+    test = plan.types.Plan()
+    plan.scheduleRenames(test, files)
+    assert len(test.resolved) == 4
+    assert len(test.steps) == 5
+
+    results = localutils.renameFiles(test.steps)
+    assert [type(x.error) for x in results].count(localerror.SameFileError) == 1
+    assert _contents(tmpdir) == {
+        'Some.Show.S01E02.ext': 'Some.Show.S01E01.ext',
+        'Some.Show.S01E03.ext': 'Some.Show.S01E02.ext',
+        'Some.Show.S01E01.ext': 'Some.Show.S01E03.ext',
+        'Other.Show.S01E01.ext': 'Other.Show.S01E01.ext',
+    }
+
+
+def test_plan_write_load(tmpdir):
+    media = tmpdir.mkdir('media')
+    files = [
+        _named(media, 'Some.Show.S01E01.ext', 'Some.Show.S01E02'),
+        _named(media, 'Some.Show.S01E02.ext', 'Some.Show.S01E01'),
+    ]
+    test = plan.types.Plan()
+    plan.scheduleRenames(test, files)
+    planPath = str(tmpdir.join('plan.jsonl'))
+    assert plan.writePlan(planPath, test.steps) == 3
+
+    steps = plan.loadPlan([planPath])
+    assert [(x.curFileName, x.newFileName) for x in steps] == [
+        (x.curFileName, x.newFileName) for x in test.steps
+    ]
+    localutils.renameFiles(steps)
+    assert _contents(media) == {
+        'Some.Show.S01E01.ext': 'Some.Show.S01E02.ext',
+        'Some.Show.S01E02.ext': 'Some.Show.S01E01.ext',
+    }
+
+
+def test_plan_load_changed(tmpdir):
+    files = [_named(tmpdir, 'Some.Show.S01E01.ext', 'Some Show - 01x01 - Pilot')]
+    planPath = str(tmpdir.join('plan.jsonl'))
+    plan.writePlan(planPath, files)
+    tmpdir.join('Some.Show.S01E01.ext').write('changed content')
+    with pytest.raises(plan.error.PlanError):
+        plan.loadPlan([planPath])
+
+
+def test_plan_load_missing(tmpdir):
+    with pytest.raises(plan.error.PlanError):
+        plan.loadPlan([str(tmpdir.join('plan.jsonl'))])
+
+
+def test_plan_load_conflicts(tmpdir):
+    media = tmpdir.mkdir('media')
+    first = plan.types.Plan()
+    plan.scheduleRenames(first, [_named(media, 'Some.Show.S01E01.ext', '01x01 - Pilot')])
+    second = plan.types.Plan()
+    plan.scheduleRenames(second, [
+        _named(media, 'Other.Show.S01E01.ext', '01x01 - Pilot'),
+        _named(media, 'Other.Show.S01E02.ext', '01x02 - Second'),
+    ])
+    plans = [str(tmpdir.join('a.plan')), str(tmpdir.join('b.plan'))]
+    plan.writePlan(plans[0], first.steps)
+    plan.writePlan(plans[1], second.steps)
+    media.join('01x02 - Second.ext').write('new')
+
+    steps = plan.loadPlan(plans)
+    assert [(x.curFileName, x.newFileName) for x in steps] == [
+        ('Some.Show.S01E01.ext', '01x01 - Pilot.ext'),
+    ]
+    localutils.renameFiles(steps)
+    assert _contents(media) == {
+        '01x01 - Pilot.ext': 'Some.Show.S01E01.ext',
+        '01x02 - Second.ext': 'new',
+        'Other.Show.S01E01.ext': 'Other.Show.S01E01.ext',
+        'Other.Show.S01E02.ext': 'Other.Show.S01E02.ext',
+    }
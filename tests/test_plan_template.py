@@ -0,0 +1,42 @@
+import pytest
+
+from renamer import plan
+from renamer.plan import template, error
+from renamer.web import types
+from renamer.localpath import types as localtypes
+
+
+def test_template_default():
+    test = template.Template()
+    assert test.format('Some Show', '01', '02', 'Pilot') == 'Some Show - 01x02 - Pilot'
+
+
+def test_template_fields():
+    test = template.Template('{show} ({year}) S{season}E{episode} {title}')
+    assert test.format('Some Show', '01', '02', 'Pilot', '2010') == 'Some Show (2010) S01E02 Pilot'
+
+
+def test_template_unknown_field():
+    with pytest.raises(error.TemplateError):
+        template.Template('{show} - {name}')
+    with pytest.raises(error.TemplateError):
+        template.Template('{0} - {1}')
+    with pytest.raises(error.TemplateError):
+        template.Template('{show')
+
+
+def test_template_policies():
+    assert template.Template('{title}').format('', '', '', 'Ação Œuvre') == 'Acao Œuvre'
+    assert template.Template('{title}', 'ascii').format('', '', '', 'Ação Œuvre') == 'Acao OEuvre'
+    assert template.Template('{title}', 'none').format('', '', '', 'Ação') == 'Ação'
+    with pytest.raises(error.TemplateError):
+        template.Template('{title}', 'foo')
+
+
+def test_template_plan(tvmaze):
+    show = types.TvShow('Some Show')
+    show.populate()
+    files = [localtypes.SerieFile('/some/path/Some.Show.S01E01.ext')]
+    template = plan.Template('{show} {year}: {title}')
+    test = plan.buildPlan(plan.groupByShow(files), {'SOMESHOW': show}, template=template)
+    assert test.resolved[0].newFileName == 'Some Show 2010 - Episode 1x1.ext'
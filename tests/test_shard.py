@@ -0,0 +1,65 @@
+import os
+
+from renamer import cli, shard, localpath
+from renamer.localpath import types
+
+
+def _files(*names):
+    return [types.SerieFile('/some/path/{}'.format(x)) for x in names]
+
+
+def test_shard_split(tmpdir):
+    files = _files(
+        'Some.Show.S01E01.ext', 'Other.Show.S01E01.ext', 'Some.Show.S01E02.ext',
+        'Third.Show.S01E01.ext', 'Fourth.Show.S02E01.ext',
+    )
+    shards = shard.splitShards(files, 3, str(tmpdir))
+    seen = {}
+    for index, test in enumerate(shards):
+        for path in localpath.readManifest(test.manifest):
+            identifier = types.SerieFile(path).identifier
+            assert seen.setdefault(identifier, index) == index
+    assert sorted(seen) == ['FOURTHSHOW', 'OTHERSHOW', 'SOMESHOW', 'THIRDSHOW']
+    assert sum(len(localpath.readManifest(x.manifest)) for x in shards) == 5
+
+
+def test_shard_index_stable():
+    assert shard.shardIndex('SOMESHOW', 4) == shard.shardIndex('SOMESHOW', 4)
+    assert 0 <= shard.shardIndex('SOMESHOW', 4) < 4
+
+
+def test_manifest_roundtrip(tmpdir):
+    files = _files('Some.Show.S01E01.ext', 'Other Show - 01x02 - Foo.ext')
+    path = str(tmpdir.join('files.manifest'))
+    localpath.writeManifest(path, files)
+    assert localpath.readManifest(path) == [
+        '/some/path/Some.Show.S01E01.ext',
+        '/some/path/Other Show - 01x02 - Foo.ext',
+    ]
+
+
+def test_shard_worker_command():
+    args = cli.setParser().parse_args(
+        ['-s', '--rate', '4', '--shards', '2', '--format', '{show} {title}', 'test']
+    )
+    test = shard.Shard('a.manifest', 'a.plan', 'a.log', 'a.out')
+    command = shard.workerCommand(test, shard.workerArgs(args, 2))
+    assert command[1:3] == ['-m', 'renamer']
+    assert command[command.index('--rate') + 1] == '2.0'
+    assert '-s' in command
+    assert command[command.index('--format') + 1] == '{show} {title}'
+    assert command[-2:] == ['--manifest', 'a.manifest']
+    assert cli.setParser().parse_args(command[3:]).plan == 'a.plan'
+
+
+def test_shard_worker_options():
+    args = cli.setParser().parse_args([
+        '--shards', '2', '--no-cache', '--full-list', '--parse-workers', '3',
+        '--sanitize', 'ascii', '--catalog', 'shows.jsonl', 'test'
+    ])
+    test = cli.setParser().parse_args(shard.workerArgs(args, 2) + ['test'])
+    assert test.no_cache and test.full_list
+    assert not test.simple and not test.offline
+    assert test.parse_workers == 3
+    assert test.sanitize == 'ascii'
+    assert test.catalog == os.path.abspath('shows.jsonl')
@@ -0,0 +1,45 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+from renamer import __main__ as renamer
+
+
+HEAVY = ['fuzzywuzzy', 'http.client', 'sqlite3', 'email.utils', 'multiprocessing', 'renamer.web']
+
+
+def _imported(*argv):
+    command = [sys.executable, '-X', 'importtime']
+    command.extend(argv)
+    proc = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    lines = [x for x in proc.stderr.decode().splitlines() if x.startswith('import time:')]
+    return [x.split('|')[-1].strip() for x in lines]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='requires -X importtime')
+def test_startup_version():
+    modules = _imported('-m', 'renamer', '--version')
+    assert 'renamer.cli' in modules
+    assert [x for x in HEAVY if x in modules] == []
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='requires -X importtime')
+def test_startup_argument_error():
+    modules = _imported('-m', 'renamer', '--jobs', 'many', 'test')
+    assert [x for x in HEAVY if x in modules] == []
+
+
+def test_startup_log_file_delayed(tmpdir):
+    logPath = str(tmpdir.join('renamer.log'))
+    logger = renamer.setupLogger('INFO', logPath)
+    try:
+        assert not os.path.exists(logPath)
+        logger.error('Something failed.')
+        assert os.path.exists(logPath)
+
+    finally:
+        for handler in list(logger.handlers):
+            handler.close()
+            logger.removeHandler(handler)
@@ -0,0 +1,50 @@
+import pytest
+
+from renamer.web import alias, cache, types, error
+
+
+@pytest.fixture
+def showCache(tmpdir, monkeypatch):
+    test = cache.Cache(str(tmpdir))
+    monkeypatch.setattr(types.Web, 'cache', test)
+    yield test
+    test.close()
+
+
+def test_alias_load(tmpdir):
+    path = tmpdir.join('aliases')
+    path.write('# Pinned shows\n\nOther Show US = 3\nSome.Show 2010 = 1\n')
+    test = alias.loadAliases(str(path))
+    assert test == {('OTHERSHOW', '', 'US'): 3, ('SOMESHOW', '2010', ''): 1}
+    assert alias.findAlias(test, 'Other Show', 'US', '2016') == 3
+    assert alias.findAlias(test, 'Other Show', 'GB') is None
+    assert alias.findAlias(test, 'Some Show') is None
+
+
+def test_alias_invalid(tmpdir):
+    path = tmpdir.join('aliases')
+    path.write('Other Show = three\n')
+    with pytest.raises(error.AliasError):
+        alias.loadAliases(str(path))
+    with pytest.raises(error.AliasError):
+        alias.loadAliases(str(tmpdir.join('missing')))
+
+
+def test_alias_override(tvmaze, monkeypatch):
+    monkeypatch.setattr(types.Web, 'aliases', {('OTHERSHOW', '', ''): 3})
+    test = types.TvShow('Other Show')
+    assert test.thetvdb == 300
+    assert tvmaze.links == ['http://api.tvmaze.com/shows/3']
+
+
+def test_alias_remembered(tvmaze, showCache):
+    first = types.TvShow('Other Show', 'GB')
+    assert len(tvmaze.links) == 1
+
+    second = types.TvShow('Other Show', 'GB')
+    assert len(tvmaze.links) == 1
+    assert second.thetvdb == first.thetvdb == 200
+    assert showCache.getAlias('OTHERSHOW', None, 'GB')
+
+    types.TvShow('Other Show', 'US')
+    assert len(tvmaze.links) == 2
@@ -0,0 +1,126 @@
+import time
+
+import pytest
+
+from renamer.web import cache, types, error
+
+
+def test_cache_put_get(tmpdir):
+    test = cache.Cache(str(tmpdir))
+    test.put('http://some/url', 'search', '[1, 2]')
+    assert test.get('http://some/url', 'search') == '[1, 2]'
+    assert test.get('http://some/url', 'episodes') is None
+    assert test.get('http://other/url', 'search') is None
+
+
+def test_cache_persistent(tmpdir):
+    test = cache.Cache(str(tmpdir))
+    test.put('http://some/url', 'search', '[1, 2]')
+    test.close()
+    test = cache.Cache(str(tmpdir))
+    assert test.get('http://some/url', 'search') == '[1, 2]'
+
+
+def test_cache_ttl(tmpdir):
+    test = cache.Cache(str(tmpdir), ttl={'episodes': 0})
+    test.put('http://some/url', 'episodes', '[]')
+    assert test.get('http://some/url', 'episodes') is None
+
+
+def test_cache_refresh(tmpdir):
+    test = cache.Cache(str(tmpdir))
+    test.put('http://some/url', 'search', '[]')
+    test.close()
+    test = cache.Cache(str(tmpdir), refresh=True)
+    assert test.get('http://some/url', 'search') is None
+
+
+def test_cache_lru_eviction(tmpdir):
+    test = cache.Cache(str(tmpdir), maxSize=20)
+    test.put('http://first/url', 'search', '0123456789')
+    time.sleep(0.01)
+    test.put('http://second/url', 'search', '0123456789')
+    time.sleep(0.01)
+    test.get('http://first/url', 'search')
+    test.put('http://third/url', 'search', '0123456789')
+    assert test.get('http://first/url', 'search') == '0123456789'
+    assert test.get('http://second/url', 'search') is None
+    assert test.get('http://third/url', 'search') == '0123456789'
+
+
+def test_cache_error(tmpdir):
+    blocker = tmpdir.join('file')
+    blocker.write('')
+    with pytest.raises(error.CacheError):
+        cache.Cache(str(blocker))
+
+
+def test_cache_broken(tmpdir):
+    test = cache.Cache(str(tmpdir))
+    test.put('http://some/url', 'search', '[]')
+    for table in ['entries', 'aliases', 'negatives']:
+        test._db.execute('DROP TABLE {}'.format(table))
+
+    # A failing cache degrades to misses and no-ops.
+    test.put('http://other/url', 'search', '[]')
+    test.touch('http://some/url')
+    assert test.get('http://some/url', 'search') is None
+    assert test.lookup('http://some/url', 'search') is None
+    test.putAlias('someshow', None, None, 'Some Show')
+    assert test.getAlias('someshow') is None
+    test.putNegative('title', 'SOMESHOW', 'Could not find SOME SHOW.')
+    assert not test.isNegative('title', 'SOMESHOW')
+    assert test.negatives() == []
+    test.close()
+
+
+def test_cache_revalidate(tmpdir):
+    test = cache.Cache(str(tmpdir), ttl={'episodes': 0})
+    test.put('http://some/url', 'episodes', '[]', etag='"abc"', modified='Mon')
+    assert test.get('http://some/url', 'episodes') is None
+    entry = test.lookup('http://some/url', 'episodes')
+    assert entry == cache.Entry(data='[]', etag='"abc"', modified='Mon')
+
+
+def test_cache_negatives(tmpdir):
+    test = cache.Cache(str(tmpdir), ttl={'file': 0})
+    test.putNegative('title', 'SOMESHOW', 'Could not find SOME SHOW.')
+    test.putNegative('file', '/some/file:1:2', "Can't find show pattern")
+    assert test.isNegative('title', 'SOMESHOW')
+    assert not test.isNegative('title', 'OTHERSHOW')
+    assert not test.isNegative('file', '/some/file:1:2')
+    assert [(x.kind, x.key) for x in test.negatives()] == [('title', 'SOMESHOW')]
+
+    failures = test.negativeSet('title')
+    assert 'SOMESHOW' in failures
+    failures.add('OTHERSHOW', 'Could not find OTHER SHOW.')
+    assert test.isNegative('title', 'OTHERSHOW')
+
+    assert test.clearNegatives() == 3
+    assert test.negatives() == []
+    test.close()
+
+
+def test_cache_negative_paths(tmpdir):
+    test = cache.Cache(str(tmpdir))
+    test.putNegative('file', '/some/file:1:2', "Can't find show pattern")
+    failures = test.negativeSet('file')
+    assert failures.hasPath('/some/file')
+    assert not failures.hasPath('/some')
+    failures.add('/other/file:3:4', "Can't find show pattern")
+    assert failures.hasPath('/other/file')
+    assert len(failures) == 2
+    test.close()
+
+
+def test_cache_negative_title(tmpdir, tvmaze, monkeypatch):
+    test = cache.Cache(str(tmpdir))
+    monkeypatch.setattr(types.Web, 'cache', test)
+    with pytest.raises(error.NotFoundError):
+        types.TvShow('Missing Show')
+    assert len(tvmaze.links) == 1
+
+    with pytest.raises(error.SkippedError):
+        types.TvShow('Missing Show')
+    assert len(tvmaze.links) == 1
+    test.close()
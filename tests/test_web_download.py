@@ -0,0 +1,44 @@
+import gzip
+
+import pytest
+
+from renamer.web import types, cache, pool, error
+
+
+class FakeClient():
+    def __init__(self, reply):
+        self.reply = reply
+        self.headers = None
+
+    def request(self, url, headers=None):
+        self.headers = headers
+        return self.reply
+
+
+@pytest.fixture
+def web(tmpdir):
+    test = types.Web()
+    test.cache = cache.Cache(str(tmpdir), ttl={'episodes': 0})
+    return test
+
+
+def test_download_gzip(web):
+    body = gzip.compress(b'[{"id": 1}]')
+    web.client = FakeClient(pool.Response(200, {'Content-Encoding': 'gzip', 'ETag': '"a"'}, body))
+    assert web._downloadData('http://some/url', 'episodes') == [{'id': 1}]
+    assert web.client.headers == {'Accept-Encoding': 'gzip'}
+    assert web.cache.lookup('http://some/url', 'episodes').etag == '"a"'
+
+
+def test_download_not_modified(web):
+    web.cache.put('http://some/url', 'episodes', '[{"id": 1}]', etag='"a"', modified='Mon')
+    web.client = FakeClient(pool.Response(304, {}, b''))
+    assert web._downloadData('http://some/url', 'episodes') == [{'id': 1}]
+    assert web.client.headers['If-None-Match'] == '"a"'
+    assert web.client.headers['If-Modified-Since'] == 'Mon'
+
+
+def test_download_error(web):
+    web.client = FakeClient(pool.Response(404, {}, b''))
+    with pytest.raises(error.DownloadError):
+        web._downloadData('http://some/url', 'episodes')
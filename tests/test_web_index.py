@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from renamer.web import index, types, error
+
+
+SHOWS = [
+    {'id': 1, 'name': 'Some Show', 'premiered': '2010-01-01', 'country': 'US', 'thetvdb': 100},
+    {'id': 2, 'name': 'Other Show', 'premiered': '2012-05-01', 'country': 'GB', 'thetvdb': 200},
+    {'id': 3, 'name': 'Other Show', 'premiered': '2016-05-01', 'country': 'US', 'thetvdb': 300},
+    {'id': 4, 'name': 'Unaired Show', 'premiered': None},
+    {'id': 5, 'name': 'Completely Different', 'premiered': '2001-01-01'},
+]
+
+
+@pytest.fixture
+def catalog(tmpdir):
+    path = tmpdir.join('catalog.jsonl')
+    path.write(''.join(json.dumps(x) + '\n' for x in SHOWS))
+    return str(path)
+
+
+def test_index_load(catalog):
+    test = index.loadCatalog(catalog)
+    assert len(test) == 4
+    assert test.shortlist('other show', 1)[0].title == 'Other Show'
+
+
+def test_index_search(catalog):
+    test = index.loadCatalog(catalog).search('Other Show')
+    assert [x.href for x in test] == [
+        'http://api.tvmaze.com/shows/2',
+        'http://api.tvmaze.com/shows/3',
+    ]
+    assert test[0].link == 'http://api.tvmaze.com/shows/2/episodes'
+
+
+def test_index_search_many(catalog, monkeypatch):
+    scored = []
+    scoreMatrix = index.match.scoreMatrix
+    monkeypatch.setattr(
+        index.match, 'scoreMatrix', lambda x, y, z: scored.append((x, y)) or scoreMatrix(x, y, z)
+    )
+    test = index.loadCatalog(catalog)
+    matches = test.searchMany(['Some Show', 'Completely Different', 'Some Show'])
+    assert list(matches) == ['Some Show', 'Completely Different']
+    assert [x.title for x in matches['Some Show']] == ['Some Show']
+    for queries, choices in scored:
+        assert choices == [x.title for x in test.shortlist(queries[0])]
+
+
+def test_index_not_found(catalog):
+    with pytest.raises(error.NotFoundError):
+        index.loadCatalog(catalog).search('Nothing Alike')
+
+
+def test_index_invalid(tmpdir):
+    path = tmpdir.join('catalog.jsonl')
+    path.write('{"name": "Some Show", "premiered": "2010-01-01"}\n')
+    with pytest.raises(error.CatalogError):
+        index.loadCatalog(str(path))
+    with pytest.raises(error.CatalogError):
+        index.loadCatalog(str(tmpdir.join('missing.jsonl')))
+
+
+def test_index_tvshow(catalog, tvmaze, monkeypatch):
+    monkeypatch.setattr(types.Web, 'index', index.loadCatalog(catalog))
+    test = types.TvShow('Other Show', 'US')
+    assert test.thetvdb == 300
+    assert not [x for x in tvmaze.links if 'search' in x]
+    assert test.episodeTitle('01', '02') == 'Episode 1x2'
+
+
+def test_index_tvshow_no_thetvdb(catalog, tvmaze, monkeypatch):
+    monkeypatch.setattr(types.Web, 'index', index.loadCatalog(catalog))
+    test = types.TvShow('Completely Different')
+    assert test.thetvdb is None
+    assert test.title == 'Completely Different'
+    with pytest.raises(error.NotFoundError):
+        types.TvShow('Other Show', 'DE')
+
+
+def test_index_offline(tmpdir, monkeypatch):
+    from renamer.web import cache
+
+    monkeypatch.setattr(types.Web, 'offline', True)
+    monkeypatch.setattr(types.Web, 'cache', cache.Cache(str(tmpdir), ttl={'episodes': 0}))
+    web = types.Web()
+    web.cache.put('http://some/url', 'episodes', '[{"id": 1}]')
+    assert web._downloadData('http://some/url', 'episodes') == [{'id': 1}]
+    with pytest.raises(error.DownloadError):
+        web._downloadData('http://other/url', 'episodes')
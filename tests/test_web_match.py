@@ -0,0 +1,68 @@
+import pytest
+
+from fuzzywuzzy import fuzz
+
+from renamer.web import match, types, utils, index
+from renamer.localpath import types as localtypes
+
+
+TITLES = ['Some Show', 'Other Show', "Marvel's Agents of S.H.I.E.L.D.", 'Completely Different']
+
+
+def _show(title, premier):
+    return types.ShowInfo(title, None, premier, None, title, title)
+
+
+def test_match_fallback_scores(monkeypatch):
+    def noRapid(*args):
+        raise ImportError()
+
+    monkeypatch.setattr(match, '_rapidScores', noRapid)
+    queries = ['Some Show', 'Marvels Agents Of S H I E L D']
+    test = match.scoreMatrix(queries, TITLES)
+    assert test == [[fuzz.WRatio(x, y) for y in TITLES] for x in queries]
+
+    test = match.scoreMatrix(queries, TITLES, cutoff=90)
+    assert test == [[100, 0, 0, 0], [0, 0, 98, 0]]
+
+
+def test_match_rapid_scores():
+    pytest.importorskip('rapidfuzz')
+    test = match.scoreMatrix(['Some Show', 'Other Show'], TITLES, cutoff=90)
+    assert test == [[100, 0, 0, 0], [0, 100, 0, 0]]
+
+
+@pytest.mark.parametrize('cutoff', [0, 85])
+def test_match_rapid_parity(cutoff):
+    pytest.importorskip('rapidfuzz')
+    queries = ['Pokemon', 'Shameless', 'Cafe', 'Marvels Agents', 'Other', 'Some Show 2010']
+    choices = TITLES + ['Pokémon', 'Office Girls', 'Café Society', 'Shameless (US)']
+    test = match._rapidScores(queries, choices, cutoff)
+    assert test == match._fuzzyScores(queries, choices, cutoff)
+    assert any(x for row in test for x in row if x not in (0, 100))
+
+
+def test_match_best_ties():
+    candidates = [_show('Other Show', '2016-05-01'), _show('Some Show', '2010-01-01'),
+                  _show('Other Show', '2012-05-01')]
+    test = match.bestMatches(['Other Show', 'Nothing Alike'], candidates, cutoff=85)
+    assert [x.premier for x in test['Other Show']] == ['2016-05-01', '2012-05-01']
+    assert test['Nothing Alike'] == []
+
+
+def test_match_shows_dict_batch(tvmaze, monkeypatch):
+    show = _show('Some Show', '2010-01-01')
+    shows = [show._replace(thetvdb=100, href='http://api.tvmaze.com/shows/1')]
+    monkeypatch.setattr(types.Web, 'index', index.ShowIndex(shows))
+    calls = []
+    searchMany = types.Web.index.searchMany
+    monkeypatch.setattr(types.Web.index, 'searchMany', lambda x: calls.append(x) or searchMany(x))
+
+    files = [
+        localtypes.SerieFile('Some.Show.S01E01.ext'),
+        localtypes.SerieFile('Missing.Show.S01E01.ext'),
+    ]
+    showInfo = utils.genShowsDict(files, jobs=2)
+    assert calls == [['Some Show', 'Missing Show']]
+    assert list(showInfo) == ['SOMESHOW']
+    assert not [x for x in tvmaze.links if 'search' in x]
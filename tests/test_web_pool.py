@@ -0,0 +1,88 @@
+import threading
+
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+
+import pytest
+
+from renamer.web import pool
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.clients.add(self.client_address)
+        if self.path == '/redirect':
+            self.send_response(301)
+            self.send_header('Location', '/data')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = b'[]'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def server():
+    httpd = Server(('127.0.0.1', 0), Handler)
+    httpd.clients = set()
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path):
+    return 'http://127.0.0.1:{}{}'.format(server.server_address[1], path)
+
+
+def test_pool_keepalive(server):
+    test = pool.ConnectionPool(2)
+    for _ in range(5):
+        down = test.request(_url(server, '/data'))
+        assert down.status == 200
+        assert down.body == b'[]'
+    assert len(server.clients) == 1
+    test.close()
+
+
+def test_pool_redirect(server):
+    test = pool.ConnectionPool(2)
+    down = test.request(_url(server, '/redirect'))
+    assert down.status == 200
+    assert down.body == b'[]'
+    test.close()
+
+
+def test_pool_threads(server):
+    test = pool.ConnectionPool(3)
+    results = []
+
+    def worker():
+        for _ in range(10):
+            results.append(test.request(_url(server, '/data')).status)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [200] * 60
+    assert len(server.clients) <= 3
+    test.close()
@@ -0,0 +1,71 @@
+import pytest
+
+from renamer.web import scheduler, pool, error
+
+
+class FakeClient():
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def request(self, url, headers=None):
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(scheduler.time, 'sleep', calls.append)
+    return calls
+
+
+def _reply(status, headers=None):
+    return pool.Response(status=status, headers=headers or {}, body=b'[]')
+
+
+def test_scheduler_retry_after(sleeps):
+    client = FakeClient([_reply(429, {'Retry-After': '3'}), _reply(200)])
+    test = scheduler.Scheduler(client, rate=0)
+    assert test.request('http://some/url').status == 200
+    assert client.calls == 2
+    assert sleeps == [3.0]
+
+
+def test_scheduler_backoff(sleeps):
+    client = FakeClient([error.DownloadError(), _reply(503), _reply(200)])
+    test = scheduler.Scheduler(client, rate=0, backoff=1.0)
+    assert test.request('http://some/url').status == 200
+    assert 0.5 <= sleeps[0] <= 1.0
+    assert 1.0 <= sleeps[1] <= 2.0
+
+
+def test_scheduler_give_up(sleeps):
+    client = FakeClient([_reply(429)] * 3)
+    test = scheduler.Scheduler(client, rate=0, retries=2)
+    assert test.request('http://some/url').status == 429
+    assert client.calls == 3
+
+
+def test_scheduler_download_error(sleeps):
+    client = FakeClient([error.DownloadError()] * 2)
+    test = scheduler.Scheduler(client, rate=0, retries=1)
+    with pytest.raises(error.DownloadError):
+        test.request('http://some/url')
+
+
+def test_token_bucket(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(scheduler.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(scheduler.time, 'sleep', lambda x: clock.__setitem__(0, clock[0] + x))
+    test = scheduler.TokenBucket(rate=2.0)
+    for _ in range(6):
+        test.acquire()
+    assert clock[0] == pytest.approx(102.0)
+
+    test.pause(5.0)
+    test.acquire()
+    assert clock[0] == pytest.approx(107.5)
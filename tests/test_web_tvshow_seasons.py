@@ -0,0 +1,43 @@
+import pytest
+
+from renamer.web import types
+
+
+def test_tvshow_populate_full(tvmaze):
+    test = types.TvShow('Some Show')
+    test.populate()
+    assert test.episodeTitle('03', '02') == 'Episode 3x2'
+    assert tvmaze.links[-1] == 'http://api.tvmaze.com/shows/1/episodes'
+
+
+def test_tvshow_populate_seasons(tvmaze):
+    test = types.TvShow('Some Show')
+    test.populate({'02'})
+    assert tvmaze.links[1:] == [
+        'http://api.tvmaze.com/shows/1/seasons',
+        'http://api.tvmaze.com/seasons/102/episodes',
+    ]
+    assert test.episodeTitle('02', '10') == 'Episode 2x10'
+    assert test.episodeTitle('02', '01') == 'Episode 2x1'
+    assert len(tvmaze.links) == 3
+
+
+def test_tvshow_populate_lazy_season(tvmaze):
+    test = types.TvShow('Some Show')
+    test.populate({'01'})
+    assert test.episodeTitle('04', '01') == 'Episode 4x1'
+    assert tvmaze.links[-1] == 'http://api.tvmaze.com/seasons/104/episodes'
+
+
+def test_tvshow_populate_unknown_season(tvmaze):
+    test = types.TvShow('Some Show')
+    test.populate({'09'})
+    assert tvmaze.links[-1] == 'http://api.tvmaze.com/shows/1/episodes'
+    assert test.episodeTitle('01', '10') == 'Episode 1x10'
+
+
+def test_tvshow_episode_error(tvmaze):
+    test = types.TvShow('Some Show')
+    test.populate()
+    with pytest.raises(KeyError):
+        test.episodeTitle('01', '11')
@@ -0,0 +1,69 @@
+import pytest
+
+from renamer.web import utils, error
+from renamer.localpath import types as localtypes
+
+
+class FakeShow():
+    def __init__(self, title, country=None, year=None, candidates=None):
+        if title == 'Wrong Name':
+            raise error.NotFoundError('Could not find WRONG NAME.')
+        self.title = title
+        self.populated = False
+
+    def populate(self, seasons=None):
+        if self.title == 'Not Cached':
+            raise error.DownloadError("Working offline, can't fetch episodes.")
+        self.populated = seasons if seasons else True
+
+
+@pytest.fixture
+def fakeShow(monkeypatch):
+    monkeypatch.setattr(utils.types, 'TvShow', FakeShow)
+    return FakeShow
+
+
+def test_utils_shows_dict(fakeShow):
+    files = [
+        localtypes.SerieFile('Some.Show.S01E01.ext'),
+        localtypes.SerieFile('Some.Show.S01E02.ext'),
+        localtypes.SerieFile('Other.Show.S02E01.ext'),
+        localtypes.SerieFile('Wrong.Name.S02E01.ext'),
+    ]
+    showInfo = utils.genShowsDict(files, jobs=4)
+    assert sorted(showInfo) == ['OTHERSHOW', 'SOMESHOW']
+    assert showInfo['SOMESHOW'].title == 'Some Show'
+
+    utils.populateShows(showInfo, jobs=4)
+    assert all(x.populated for x in showInfo.values())
+
+
+def test_utils_shows_dict_error(fakeShow):
+    files = [localtypes.SerieFile('Wrong.Name.S02E01.ext')]
+    with pytest.raises(error.NotFoundError):
+        utils.genShowsDict(files, jobs=2)
+
+
+def test_utils_seasons_dict(fakeShow):
+    files = [
+        localtypes.SerieFile('Some.Show.S01E01.ext'),
+        localtypes.SerieFile('Some.Show.S02E02.ext'),
+        localtypes.SerieFile('Other.Show.S02E01.ext'),
+    ]
+    seasons = utils.genSeasonsDict(files)
+    assert seasons == {'SOMESHOW': {'01', '02'}, 'OTHERSHOW': {'02'}}
+
+    showInfo = utils.genShowsDict(files)
+    utils.populateShows(showInfo, seasons=seasons)
+    assert showInfo['SOMESHOW'].populated == {'01', '02'}
+
+
+def test_utils_populate_download_error(fakeShow):
+    files = [
+        localtypes.SerieFile('Some.Show.S01E01.ext'),
+        localtypes.SerieFile('Not.Cached.S01E01.ext'),
+    ]
+    showInfo = utils.genShowsDict(files)
+    utils.populateShows(showInfo, jobs=2)
+    assert list(showInfo) == ['SOMESHOW']
+    assert showInfo['SOMESHOW'].populated